@@ -0,0 +1,62 @@
+"""
+.SYNOPSIS
+    Benchmark of sequential and parallel fund loading in Analyzer.
+
+.DESCRIPTION
+    Starts local stub of quotation API with injected latency and measures wall time
+    of Analyzer initialization for MaxConcurrency equal 1 and for provided value.
+
+    Run from repository root:
+        python -m Benchmarks.Benchmark_ConcurrentDownload --Funds 50 --Latency 0.1 --Max_Concurrency 8
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import argparse
+import time
+
+from Dependencies.Class_Analyzer import Analyzer
+from Benchmarks.Function_StubServer import StubQuotationServer, generateFundURLs
+
+parser = argparse.ArgumentParser(description="Benchmark of parallel fund downloads")
+parser.add_argument("--Funds", type=int, default=50, help="Number of funds to download")
+parser.add_argument("--Latency", type=float, default=0.1, help="Injected API latency in seconds")
+parser.add_argument("--Max_Concurrency", type=int, default=8, help="Number of parallel downloads")
+parser.add_argument("--Time_Period_In_Months", type=int, default=1)
+
+
+def measureAnalyzerInit(URLs: list[str], timePeriod: int, maxConcurrency: int) -> float:
+    start = time.perf_counter()
+    Analyzer(URLs=URLs, TimePeriodInMonths=timePeriod, MaxConcurrency=maxConcurrency)
+    return time.perf_counter() - start
+
+
+def main(options):
+    URLs = generateFundURLs(options.Funds)
+
+    with StubQuotationServer(latencyInSeconds=options.Latency):
+        # warm up payload generation, so it is not included in measurements
+        measureAnalyzerInit(URLs, options.Time_Period_In_Months, options.Max_Concurrency)
+
+        sequential = measureAnalyzerInit(URLs, options.Time_Period_In_Months, 1)
+        parallel = measureAnalyzerInit(
+            URLs, options.Time_Period_In_Months, options.Max_Concurrency
+        )
+
+    print(f"Funds: {options.Funds}, latency: {options.Latency}s")
+    print(f"MaxConcurrency 1: {sequential:8.3f}s")
+    print(f"MaxConcurrency {options.Max_Concurrency}: {parallel:8.3f}s")
+    print(f"Speedup: {sequential / parallel:6.2f}x")
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
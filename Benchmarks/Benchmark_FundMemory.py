@@ -0,0 +1,102 @@
+"""
+.SYNOPSIS
+    Benchmark of memory used by fund quotation layouts.
+
+.DESCRIPTION
+    Builds quotation of provided number of funds with derived columns
+    (day to day, week to week, month to month change and refund rate) in two layouts:
+        - list of dicts with string dates (layout used before FundSeries)
+        - FundSeries with NumPy arrays
+    and measures memory allocated by each of them with tracemalloc.
+
+    Run from repository root:
+        python -m Benchmarks.Benchmark_FundMemory --Funds 200 --Days 3650
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import argparse
+import gc
+import tracemalloc
+
+from Dependencies.Class_FundSeries import FundSeries
+from Dependencies.Function_Calculation import calculateLaggedChange
+from Dependencies.Function_DownloadFundQuotation import convertQuotationToColumns
+from Benchmarks.Function_StubServer import generateQuotationPayload
+
+parser = argparse.ArgumentParser(description="Benchmark of memory used by fund quotation layouts")
+parser.add_argument("--Funds", type=int, default=200, help="Number of funds")
+parser.add_argument("--Days", type=int, default=3650, help="Number of calendar days per fund")
+
+global derivedColumns
+
+derivedColumns = {
+    "Day_to_day_%": 1,
+    "Week_to_week_%": 7,
+    "Month_to_month_%": 30,
+}
+
+
+def buildDictLayout(quotations: list[list[dict]]) -> list[list[dict]]:
+    funds = []
+    for quotation in quotations:
+        rows = [dict(item) for item in quotation]
+        dates, values = convertQuotationToColumns(quotation)
+        for columnName, period in derivedColumns.items():
+            for row, change in zip(rows, calculateLaggedChange(dates, values, period).tolist()):
+                row[columnName] = change
+        initialValue = float(rows[0]["value"])
+        for row in rows:
+            row["RefundRate_%"] = round(((float(row["value"]) / initialValue) - 1) * 100, 2)
+        funds.append(rows)
+    return funds
+
+
+def buildSeriesLayout(quotations: list[list[dict]]) -> list[FundSeries]:
+    funds = []
+    for quotation in quotations:
+        series = FundSeries(*convertQuotationToColumns(quotation))
+        for columnName, period in derivedColumns.items():
+            series.setColumn(columnName, calculateLaggedChange(series.Date, series.Value, period))
+        series.setColumn("RefundRate_%", ((series.Value / series.Value[0]) - 1) * 100)
+        funds.append(series)
+    return funds
+
+
+def measureMemory(buildLayout, quotations: list[list[dict]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    layout = buildLayout(quotations)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del layout
+    return allocated
+
+
+def main(options):
+    quotations = [
+        generateQuotationPayload(f"MEM{i:04}", options.Days)["series"][0]["price"]
+        for i in range(0, options.Funds)
+    ]
+    rows = sum(len(quotation) for quotation in quotations)
+
+    dictLayout = measureMemory(buildDictLayout, quotations)
+    seriesLayout = measureMemory(buildSeriesLayout, quotations)
+
+    print(f"Funds: {options.Funds}, quotations: {rows}")
+    print(f"List of dicts: {dictLayout / 1024 / 1024:10.2f} MB ({dictLayout / rows:7.1f} B per row)")
+    print(f"FundSeries:    {seriesLayout / 1024 / 1024:10.2f} MB ({seriesLayout / rows:7.1f} B per row)")
+    print(f"Reduction:     {dictLayout / seriesLayout:10.2f}x")
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
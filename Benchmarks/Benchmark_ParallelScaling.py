@@ -0,0 +1,91 @@
+"""
+.SYNOPSIS
+    Benchmark of summary calculation scaling with number of worker processes.
+
+.DESCRIPTION
+    Generates synthetic quotations of provided number of funds and measures time of Analyzer
+    construction (without download) with 1 to MaxWorkers worker processes.
+    Speedup and efficiency comparing to 1 worker (calculation in main process) is reported,
+    results can be saved as JSON.
+
+    Run from repository root:
+        python -m Benchmarks.Benchmark_ParallelScaling --Funds 2000 --Days 3650 --MaxWorkers 8
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from Dependencies.Class_Analyzer import Analyzer
+from Dependencies.Function_DownloadFundQuotation import decodeFundSeries, filterFundSeries
+from Benchmarks.Function_StubServer import generateFundURLs, generateQuotationPayload
+
+parser = argparse.ArgumentParser(description="Benchmark of summary calculation scaling with worker processes")
+parser.add_argument("--Funds", type=int, default=2000, help="Number of funds")
+parser.add_argument("--Days", type=int, default=3650, help="Number of calendar days per fund")
+parser.add_argument("--Months", type=int, nargs="+", default=[1, 3, 6, 12, 36], help="Analyzed time periods")
+parser.add_argument("--MaxWorkers", type=int, default=os.cpu_count(), help="Maximum number of worker processes")
+parser.add_argument("--Repeats", type=int, default=3, help="Number of repeats per number of workers")
+parser.add_argument("--Output", action="store", help="JSON file to save results to")
+
+
+def main(options):
+    URLs = generateFundURLs(options.Funds)
+    series = {
+        url: decodeFundSeries(
+            json.dumps(generateQuotationPayload(url.split("/")[4], options.Days)).encode()
+        )
+        for url in URLs
+    }
+
+    results = {}
+    for workers in range(1, options.MaxWorkers + 1):
+        measurements = []
+        for _ in range(0, options.Repeats):
+            # derived columns are memoized, so each repeat gets new windows
+            downloadedQuotations = {
+                url: filterFundSeries(fundSeries, options.Months[0]) for url, fundSeries in series.items()
+            }
+            start = time.perf_counter()
+            Analyzer(
+                URLs=URLs,
+                TimePeriodInMonths=options.Months,
+                DownloadedQuotations=downloadedQuotations,
+                Workers=workers
+            )
+            measurements.append(time.perf_counter() - start)
+        results[workers] = statistics.median(measurements)
+
+    print(f"Funds: {options.Funds}, days: {options.Days}, time periods: {options.Months}, CPUs: {os.cpu_count()}")
+    for workers, result in results.items():
+        speedup = results[1] / result
+        print(f"Workers {workers:3}: {result * 1000:10.1f} ms, speedup {speedup:5.2f}x, efficiency {speedup / workers * 100:5.1f} %")
+
+    if options.Output != None:
+        with open(options.Output, "w") as outputFile:
+            json.dump(
+                {
+                    "Parameters": vars(options),
+                    "CPUs": os.cpu_count(),
+                    "Results": {str(workers): result * 1000 for workers, result in results.items()},
+                },
+                outputFile,
+                indent=4
+            )
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
@@ -0,0 +1,66 @@
+"""
+.SYNOPSIS
+    Benchmark of program startup time with and without plotting.
+
+.DESCRIPTION
+    Starts fresh interpreter multiple times and measures time of importing modules required by:
+        - headless mode (--no-plot), where matplotlib is never imported
+        - plot mode, where matplotlib.pyplot is imported to show the figure
+    Median of all runs is reported for both paths.
+
+    Run from repository root:
+        python -m Benchmarks.Benchmark_StartupTime --Runs 10
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+parser = argparse.ArgumentParser(description="Benchmark of program startup time")
+parser.add_argument("--Runs", type=int, default=10, help="Number of interpreter starts per path")
+
+global startupPaths
+
+startupPaths = {
+    "Headless (--no-plot)": "import Main_Fund_Analyzer",
+    "Plot": "import Main_Fund_Analyzer; import matplotlib.pyplot; import matplotlib.dates",
+}
+
+
+def measureStartup(code: str, runs: int) -> float:
+    # Agg backend does not need display, so benchmark can run on servers as well
+    environment = dict(os.environ, MPLBACKEND="Agg")
+    results = []
+    for _ in range(0, runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=environment)
+        results.append(time.perf_counter() - start)
+    return statistics.median(results)
+
+
+def main(options):
+    # warm up file system cache, so the first measured path is not penalized
+    measureStartup(startupPaths["Plot"], 1)
+
+    results = {name: measureStartup(code, options.Runs) for name, code in startupPaths.items()}
+    for name, result in results.items():
+        print(f"{name:22}: {result * 1000:8.1f} ms")
+    print(f"Saved by headless mode: {(results['Plot'] - results['Headless (--no-plot)']) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
@@ -0,0 +1,252 @@
+"""
+.SYNOPSIS
+    Benchmark suite of program hot paths on synthetic quotations.
+
+.DESCRIPTION
+    Generates synthetic analizy.pl API payloads of provided number of funds and days
+    (the same generator as stub server uses, so results are reproducible for given seed),
+    and measures:
+        - filterQuotation
+        - Fund.calculateValueChange for 1, 7 and 30 days periods
+        - Fund.calculateRefundRate
+        - Fund.refundsBetween of random pairs of dates
+        - Analyzer.calculateSummaryDetails
+        - convertNumericToStrPlsMnsSigns of all summary rows
+        - TableFormatter.writeTable of all summary rows
+        - whole Analyzer construction, downloading from local stub server
+    Each case is repeated and minimum and median time is reported.
+    Derived columns are memoized, so each repeat of column calculation gets new Fund instance,
+    created outside of measured time.
+
+    Results are saved as JSON with commit hash and parameters, and can be compared with results
+    saved for another commit:
+        python -m Benchmarks.Benchmark_Suite --Output before.json
+        git checkout <other commit>
+        python -m Benchmarks.Benchmark_Suite --Output after.json --Compare before.json
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import numpy as np
+
+from Dependencies.Class_Analyzer import Analyzer
+from Dependencies.Class_Fund import Fund
+from Dependencies.Class_TableFormatter import TableFormatter
+from Dependencies.Function_Conversion import convertNumericToStrPlsMnsSigns
+from Dependencies.Function_DownloadFundQuotation import (
+    decodeFundSeries,
+    filterFundSeries,
+    filterQuotation,
+)
+from Benchmarks.Function_StubServer import (
+    StubQuotationServer,
+    generateFundURLs,
+    generateQuotationPayload,
+)
+
+parser = argparse.ArgumentParser(description="Benchmark suite of program hot paths")
+parser.add_argument("--Funds", type=int, default=50, help="Number of funds")
+parser.add_argument("--Days", type=int, default=3650, help="Number of calendar days per fund")
+parser.add_argument("--Months", type=int, default=12, help="Analyzed time period in months")
+parser.add_argument("--Repeats", type=int, default=5, help="Number of repeats of each case")
+parser.add_argument("--Queries", type=int, default=10000, help="Number of pairs of dates per fund in refund queries")
+parser.add_argument("--Seed", type=int, default=0, help="Seed of synthetic quotation generator")
+parser.add_argument("--Output", action="store", help="JSON file to save results to")
+parser.add_argument("--Compare", action="store", help="JSON file with results to compare with")
+
+global valueChangePeriods
+
+valueChangePeriods = [1, 7, 30]
+
+
+def measure(case, repeats: int, setup=None) -> dict[str, float]:
+    results = []
+    for _ in range(0, repeats):
+        # prepare input outside of measured time
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        case(argument)
+        results.append(time.perf_counter() - start)
+    return {
+        "Repeats": repeats,
+        "MinInMs": min(results) * 1000,
+        "MedianInMs": statistics.median(results) * 1000,
+    }
+
+
+def getCommit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def runBenchmarks(options) -> dict[str, dict[str, float]]:
+    URLs = generateFundURLs(options.Funds)
+    payloads = {
+        url: generateQuotationPayload(url.split("/")[4], options.Days, options.Seed)
+        for url in URLs
+    }
+    contents = {url: json.dumps(payload).encode() for url, payload in payloads.items()}
+
+    def createFunds(_=None) -> list[Fund]:
+        return [
+            Fund(
+                URL=url,
+                TimePeriodInMonths=options.Months,
+                DownloadedQuotation=filterFundSeries(decodeFundSeries(content), options.Months)
+            )
+            for url, content in contents.items()
+        ]
+
+    results = {}
+
+    results["filterQuotation"] = measure(
+        lambda _: [
+            filterQuotation(payload["series"][0]["price"], options.Months)
+            for payload in payloads.values()
+        ],
+        options.Repeats
+    )
+
+    for period in valueChangePeriods:
+        results[f"Fund.calculateValueChange({period})"] = measure(
+            lambda funds: [
+                fund.calculateValueChange(period, window)
+                for fund in funds
+                for window in (fund.Quotation, fund.LastYearQuotation)
+            ],
+            options.Repeats,
+            createFunds
+        )
+
+    results["Fund.calculateRefundRate"] = measure(
+        lambda funds: [
+            fund.calculateRefundRate(window)
+            for fund in funds
+            for window in (fund.Quotation, fund.LastYearQuotation)
+        ],
+        options.Repeats,
+        createFunds
+    )
+
+    # random pairs of dates within generated series, the same for each fund
+    generator = np.random.default_rng(options.Seed)
+    queryFunds = createFunds()
+    firstDate = min(fund.Series.Date[0] for fund in queryFunds)
+    offsets = np.sort(generator.integers(0, options.Days, size=(options.Queries, 2)), axis=1)
+    results["Fund.refundsBetween"] = measure(
+        lambda _: [
+            fund.refundsBetween(firstDate + offsets[:, 0], firstDate + offsets[:, 1])
+            for fund in queryFunds
+        ],
+        options.Repeats
+    )
+
+    # Analyzer on already decoded quotations, so only summary is measured
+    analyzer = Analyzer(
+        URLs=URLs,
+        TimePeriodInMonths=options.Months,
+        DownloadedQuotations={
+            url: filterFundSeries(decodeFundSeries(content), options.Months)
+            for url, content in contents.items()
+        }
+    )
+    results["Analyzer.calculateSummaryDetails"] = measure(
+        lambda _: analyzer.calculateSummaryDetails(analyzer.getDataToPlots()[0], {}),
+        options.Repeats
+    )
+
+    results["convertNumericToStrPlsMnsSigns"] = measure(
+        lambda _: [
+            convertNumericToStrPlsMnsSigns(
+                inputData=row,
+                columnsExcludedFromSigns=analyzer.RiskColumnsExcludedFromSigns,
+                currencyColumnNames=[],
+                currency="",
+                percentageColumnNames=analyzer.SummaryPercentageColumns + analyzer.RiskPercentageColumns,
+            )
+            for row in analyzer.Summary.values()
+        ],
+        options.Repeats
+    )
+
+    results["TableFormatter.writeTable"] = measure(
+        lambda _: TableFormatter(
+            Headers=list(next(iter(analyzer.Summary.values())).keys()),
+            ColumnsExcludedFromSigns=analyzer.RiskColumnsExcludedFromSigns,
+            PercentageColumnNames=analyzer.SummaryPercentageColumns + analyzer.RiskPercentageColumns,
+        ).writeTable(list(analyzer.Summary.values()), io.StringIO()),
+        options.Repeats
+    )
+
+    with StubQuotationServer(0, options.Days):
+        results["Analyzer"] = measure(
+            lambda _: Analyzer(URLs=URLs, TimePeriodInMonths=options.Months),
+            options.Repeats
+        )
+
+    return results
+
+
+def compareResults(results: dict, previousResults: dict):
+    print(f"\nComparison with {previousResults.get('Commit')}:")
+    for name, result in results.items():
+        previous = previousResults["Results"].get(name)
+        if previous is None:
+            continue
+        ratio = result["MedianInMs"] / previous["MedianInMs"]
+        print(f"{name:40}: {previous['MedianInMs']:10.3f} ms -> {result['MedianInMs']:10.3f} ms ({ratio:6.2f}x)")
+    return None
+
+
+def main(options):
+    results = runBenchmarks(options)
+
+    for name, result in results.items():
+        print(f"{name:40}: min {result['MinInMs']:10.3f} ms, median {result['MedianInMs']:10.3f} ms")
+
+    report = {
+        "Commit": getCommit(),
+        "Python": platform.python_version(),
+        "NumPy": np.__version__,
+        "Parameters": {
+            "Funds": options.Funds,
+            "Days": options.Days,
+            "Months": options.Months,
+            "Repeats": options.Repeats,
+            "Seed": options.Seed,
+        },
+        "Results": results,
+    }
+
+    if options.Output != None:
+        with open(options.Output, "w") as outputFile:
+            json.dump(report, outputFile, indent=4)
+
+    if options.Compare != None:
+        with open(options.Compare, "r") as previousFile:
+            compareResults(results, json.load(previousFile))
+
+
+if __name__ == "__main__":
+    main(parser.parse_args())
@@ -0,0 +1,155 @@
+"""
+.DESCRIPTION
+    Module of helpers to run benchmarks without access to www.Analizy.pl
+
+    generateQuotationPayload
+        generates synthetic API response in the same shape as analizy.pl quotation API
+
+    generateFundURLs
+        generates fund URLs matching the structure of analizy.pl fund pages
+
+    StubQuotationServer
+        local HTTP server serving synthetic quotations with injected latency,
+        usable as context manager, redirects quotation API to itself while running,
+        answers with ETag and 304 Not Modified when quotation of fund did not change,
+        new quotation of fund is published with publishQuotation()
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pendulum
+
+import Dependencies.Function_DownloadFundQuotation as quotationAPI
+
+global stubFundCategory
+
+stubFundCategory = "fundusze-inwestycyjne-otwarte"
+
+
+def generateQuotationPayload(fundID: str, numOfDays: int = 750, seed: int = 0) -> dict:
+    rng = random.Random(f"{fundID}-{seed}")
+    value = rng.uniform(50, 150)
+    date = pendulum.today().date().subtract(days=numOfDays)
+
+    prices = []
+    for _ in range(0, numOfDays + 1):
+        # funds are not quoted on weekends
+        if date.weekday() < 5:
+            value *= 1 + rng.gauss(0, 0.006)
+            prices.append({"date": date.to_date_string(), "value": round(value, 2)})
+        date = date.add(days=1)
+
+    return {
+        "id": fundID,
+        "currency": "PLN",
+        "series": [{"price": prices}]
+    }
+
+
+def generateFundURLs(numOfFunds: int) -> list[str]:
+    return [
+        f"https://www.analizy.pl/{stubFundCategory}/BEN{i:04}/benchmark-fund-{i}"
+        for i in range(0, numOfFunds)
+    ]
+
+
+class StubQuotationServer:
+
+    def __init__(self, latencyInSeconds: float = 0.0, numOfDays: int = 750):
+        self.LatencyInSeconds = latencyInSeconds
+        self.NumOfDays = numOfDays
+        self.RequestCount = 0
+        self.NotModifiedCount = 0
+        self.Payloads = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._createHandler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._originalAPI = quotationAPI.analizyplQuotationAPI
+
+    def getURL(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/api/quotation"
+
+    def getPayload(self, fundID: str) -> bytes:
+        # generate payload once per fund, so each request is answered with the same data
+        with self._lock:
+            self.RequestCount += 1
+            if fundID not in self.Payloads:
+                self.Payloads[fundID] = json.dumps(
+                    generateQuotationPayload(fundID, self.NumOfDays)
+                ).encode()
+            return self.Payloads[fundID]
+
+    def publishQuotation(self, fundID: str, value: float | None = None):
+        # new quotation of the same day replaces the last one, as intraday valuation does
+        with self._lock:
+            payload = json.loads(self.Payloads[fundID])
+            prices = payload["series"][0]["price"]
+            today = pendulum.today().date().to_date_string()
+            if value is None:
+                value = round(prices[-1]["value"] * 1.001, 2)
+            if prices[-1]["date"] == today:
+                prices.pop()
+            prices.append({"date": today, "value": value})
+            self.Payloads[fundID] = json.dumps(payload).encode()
+        return None
+
+    def _createHandler(self):
+        stub = self
+
+        class QuotationHandler(BaseHTTPRequestHandler):
+            # HTTP/1.1 allows client to keep connection alive between requests
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, without it each response waits for delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                time.sleep(stub.LatencyInSeconds)
+                body = stub.getPayload(self.path.rstrip("/").split("/")[-1])
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.NotModifiedCount += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return None
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                return None
+
+        return QuotationHandler
+
+    def __enter__(self):
+        self._thread.start()
+        quotationAPI.analizyplQuotationAPI = self.getURL()
+        return self
+
+    def __exit__(self, *exc):
+        quotationAPI.analizyplQuotationAPI = self._originalAPI
+        self._server.shutdown()
+        self._server.server_close()
+        return False
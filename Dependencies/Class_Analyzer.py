@@ -5,10 +5,52 @@
     
     To init the instance of the class you need to provide:
         - URLs <- list of urls to fund's sites on www.Analizy.pl
-        - TimePeriodInMonths <- int number how many months you would like to analyze.
+        - TimePeriodInMonths <- int number how many months you would like to analyze,
+                                or list of them to analyze many time periods from one download,
+                                the first one is used for plot, Summary and LastYearSummary.
+    Optionally:
+        - MaxConcurrency <- int number of funds downloaded in parallel (default 1 - one after another).
+        - Workers <- int number of processes to calculate summary in (default 1 - in current process),
+                     quotations are passed to them in shared memory.
+        - DownloadedQuotations <- dict of already downloaded quotations per URL, download is skipped for them.
+        - LoadedFunds <- dict of already created Fund instances per URL, they are used as they are,
+                         together with derived columns calculated for them so far.
+        - Cache <- dict with local quotation cache settings:
+            Enabled, Directory, TTLInMinutes, MaxSizeInMB, Refresh (see QuotationCache class).
+        - UniverseFile <- path to file saved with .saveUniverse(), funds are loaded from it without downloading,
+                          if URLs list is empty all funds from the file are analyzed.
+        - StreamQuotation <- if True (and cache is disabled) quotations are decoded while being downloaded,
+                             only quotations needed by the longest time period are kept in memory.
+        - RiskFreeRate <- yearly risk free rate in % used for Sharpe and Sortino ratio (default 0).
+        - VolatilityWindowInDays <- number of quotations in rolling volatility window (default 21).
+        - Lags <- list of numbers of days (e.g. [1, 7, 30, 90, 365]) to calculate change of quotation over,
+                  all of them in one pass, displayed as summary columns (as of the last quotation)
+                  and additional subplots (default empty - disabled).
+        - SeasonalYears <- number of previous years to compare the same period of the first time period in
+                           (default 0 - disabled), e.g. 10 with 3 months compares the same quarter in last 10 years.
+    
+    To download all funds on asyncio event loop use factory method:
+        analyzer = await Analyzer.create_async(URLs, TimePeriodInMonths)
     
     All calculations are performed automatically during post initialization, so the only thing is to use
     .showAnalysisPyPlot() method to show plot and summary in console.
+    Without display (e.g. on servers) use .showAnalysisTables() or .exportSummary("json" | "csv"),
+    and .savePlot("<path>.png" | ".svg" | ".pdf") to draw plot to file with non-interactive backend,
+    matplotlib is imported only when plot is requested.
+    Data to plot is prepared with .getDataToPlots() on first draw, summary only analysis does not prepare it.
+    
+    New quotations are added with .appendQuotations() and windows are moved with .slideWindows(),
+    both update Refund, Raise ratio, Avg Increase and Avg Decrease of current period summaries
+    in constant time per fund, other columns are updated with the next full analysis.
+    When whole quotation of some funds is replaced (Fund.updateQuotation()), .recalculateFunds()
+    calculates again only their rows, and .exportSummary(..., funds=[...]) displays only them.
+    
+    Seasonal summary (SeasonalYears > 0) has one row per fund and year, windows of all years are views
+    of the same series, metrics of all funds and years are calculated at once.
+    It is displayed as additional summary table and drawn with .saveSeasonalityPlot().
+    
+    Correlation and covariance of daily changes of all funds are calculated with .calculateCorrelation(),
+    on quotations aligned to one calendar, and displayed with .exportCorrelation() or .saveCorrelationPlot().
     
 .NOTES
 
@@ -24,24 +66,58 @@
 """
 # Official and 3-rd party imports
 from dataclasses import dataclass, field
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from tabulate import tabulate
+import datetime
+import math
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import json
+import sys
+from typing import TextIO
 
 
 # Custom created class modules
 from Dependencies.Class_Fund import Fund
+from Dependencies.Class_FundSeries import FundSeries
+from Dependencies.Class_QuotationCache import QuotationCache
+from Dependencies.Class_Profiler import profileStage
+from Dependencies.Class_UniverseStore import UniverseStore
+from Dependencies.Class_TableFormatter import TableFormatter
 
 # Custom created function modules
-from Dependencies.Function_Conversion import convertNumericToStrPlsMnsSigns
-from Dependencies.Function_DownloadFundQuotation import getFundIDfromURL
+from Dependencies.Function_Calculation import (
+    calculateSummaryMetrics,
+    calculateWindowRefunds,
+    alignSeries,
+    calculateCorrelationMatrix,
+)
+from Dependencies.Function_ParallelAnalysis import calculateHorizonSummaryInWorkers
+from Dependencies.Function_DownloadFundQuotation import (
+    getFundIDfromURL,
+    createHTTPSession,
+    getEarliestNeededDate,
+    getWindowDates,
+    getSeasonalWindowDates,
+)
 
 
 @dataclass(kw_only=False)
 class Analyzer:
     # Initialization Variables
     URLs: list[str]
-    TimePeriodInMonths: int
+    TimePeriodInMonths: int | list[int]
+    MaxConcurrency: int = 1
+    Workers: int = 1
+    DownloadedQuotations: dict[str, dict] = field(
+        default_factory=dict, repr=False, compare=False)
+    Cache: dict[str, str | float | bool] = field(default_factory=dict, repr=False)
+    LoadedFunds: dict[str, Fund] = field(
+        default_factory=dict, repr=False, compare=False)
+    StreamQuotation: bool = False
+    UniverseFile: str | None = None
+    RiskFreeRate: float = 0.0
+    VolatilityWindowInDays: int = 21
+    SeasonalYears: int = 0
+    Lags: list[int] = field(default_factory=list)
 
     # Constant Variables
     WindowPlotTitle = "Fund analysis plot"
@@ -70,7 +146,7 @@ class Analyzer:
     LegendLocation = "upper right"
     XaxisLabelRotation = 45
     XaxisDesiredNumOfLabels = 31
-    PlotDateFormatter = mdates.DateFormatter("%Y-%m-%d")
+    PlotDateFormat = "%Y-%m-%d"
 
     PlotGridStyle = {
         "which": "both",
@@ -82,16 +158,30 @@ class Analyzer:
         "Value": 0,
         "Color": "k"
     }
+    SummaryPercentageColumns = ["Refund", "Raise ratio", "Avg Increase", "Avg Decrease"]
+    RiskPercentageColumns = ["Rolling Volatility", "Max Drawdown"]
+    RiskColumnsExcludedFromSigns = ["Rolling Volatility", "Recovery days"]
+    LastYearColumnPrefix = "Last year "
+    CorrelationRoundDigits = 2
+    CorrelationPlotTitle = "Correlation of daily changes"
+    SeasonalPeriodColumn = "Window"
+    LagColumnFormat = "Change {} days"
+    LagPlotYaxisLabel = "Price change %"
+    SeasonalPlotTitle = "Refund rate % in the same period of previous years"
+    SeasonalPlotXaxisLabel = "Days since period start"
 
     # Calculated Variables
+    TimePeriods: list[int] = field(
+        default_factory=list, init=False, repr=False)
+
     FundsList: dict[str, Fund] = field(
         default_factory=dict, init=False, repr=False)
 
-    DataToPlots: dict[str, dict[str, list[dict[str, str | float]]]] = field(
+    DataToPlots: dict[str, dict[str, FundSeries]] = field(
         default_factory=dict, init=False, repr=False
     )
 
-    LastYearDataToPlots: dict[str, dict[str, list[dict[str, str | float]]]] = field(
+    LastYearDataToPlots: dict[str, dict[str, FundSeries]] = field(
         default_factory=dict, init=False, repr=False
     )
 
@@ -103,249 +193,666 @@ class Analyzer:
         default_factory=dict, init=False
     )
 
+    HorizonSummary: dict[int, dict[str, dict[str, dict[str, float | int]]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    CorrelationMatrix: dict[int, dict] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    SeasonalPeriods: dict[int, tuple[datetime.date, datetime.date]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    SeasonalSummary: dict[str, dict[int, dict[str, float | int | str]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
     def __post_init__(self):
 
-        # Loop through each URL, create Fund class instance and calculate Day to Day price change
-        for item in self.URLs:
-            ID = getFundIDfromURL(item)
-            self.FundsList[ID] = Fund(
-                URL=item, TimePeriodInMonths=self.TimePeriodInMonths)
-            self.FundsList[ID].calculateDayToDayChange()
+        # Time periods to analyze, the first one is the main one
+        self.TimePeriods = self.getTimePeriods(self.TimePeriodInMonths)
+
+        # Change over each lag is drawn on additional subplot
+        if len(self.Lags) > 0:
+            self.PlotOrder = dict(self.PlotOrder)
+            for column in self.getLagColumns():
+                self.PlotOrder[len(self.PlotOrder)] = {
+                    "title": column,
+                    "X_axis_label": "Time",
+                    "Y_axis_label": self.LagPlotYaxisLabel,
+                }
+
+        # Create Fund class instance for each URL,
+        # derived columns like Day to Day price change are calculated on first use
+        with profileStage("Load funds"):
+            self.loadFunds()
+
+        # Calculate data to display in summary tables for each time period,
+        # all of them are windows of the same downloaded series
+        with profileStage("Calculate summary"):
+            if self.Workers > 1 and len(self.FundsList) > 1:
+                # CPU bound calculations of shards of funds in parallel processes
+                self.HorizonSummary = calculateHorizonSummaryInWorkers(self, self.Workers)
+            else:
+                self.calculateHorizonSummary()
+        self.Summary = self.HorizonSummary[self.TimePeriods[0]]["Current"]
+        self.LastYearSummary = self.HorizonSummary[self.TimePeriods[0]]["LastYear"]
+
+        # Same period of main time period in previous years
+        if self.SeasonalYears > 0:
+            with profileStage("Calculate seasonal summary"):
+                self.calculateSeasonalSummary()
+        return None
 
-        # Calculate data for plot
-        self.prepareDataToPlot()
+    @staticmethod
+    def getTimePeriods(TimePeriodInMonths: int | list[int]) -> list[int]:
+        if isinstance(TimePeriodInMonths, int):
+            return [TimePeriodInMonths]
+        if len(TimePeriodInMonths) == 0:
+            raise ValueError("At least one time period must be provided")
+        return list(TimePeriodInMonths)
+
+    @classmethod
+    async def create_async(
+        cls,
+        URLs: list[str],
+        TimePeriodInMonths: int,
+        MaxConcurrency: int = 8,
+        TimeoutInSeconds: float = 30,
+        Retries: int = 3,
+        **kwargs
+    ) -> "Analyzer":
+        # Imported here, so the sync path does not require aiohttp
+        from Dependencies.Function_DownloadFundQuotationAsync import downloadFundsQuotationAsync
+
+        # Download all funds on running event loop, MaxConcurrency limits connections to API host
+        quotations = await downloadFundsQuotationAsync(
+            URLs,
+            cls.getTimePeriods(TimePeriodInMonths)[0],
+            connectionsPerHost=MaxConcurrency,
+            timeoutInSeconds=TimeoutInSeconds,
+            retries=Retries,
+        )
 
-        # Calculate data to display in summary table
-        self.calculateSummaryDetails(self.DataToPlots, self.Summary)
+        return cls(
+            URLs=URLs,
+            TimePeriodInMonths=TimePeriodInMonths,
+            MaxConcurrency=MaxConcurrency,
+            DownloadedQuotations=dict(zip(URLs, quotations)),
+            **kwargs
+        )
+
+    def loadFunds(self):
+
+        # Funds from universe file are views of memory-mapped arrays, nothing is downloaded for them
+        if self.UniverseFile is not None:
+            universe = UniverseStore.open(self.UniverseFile)
+            if len(self.URLs) == 0:
+                self.URLs = universe.getURLs()
+            self.DownloadedQuotations = dict(self.DownloadedQuotations)
+            for url in self.URLs:
+                if universe.hasFund(url) and url not in self.DownloadedQuotations:
+                    self.DownloadedQuotations[url] = universe.getFundQuotation(url, self.TimePeriods[0])
+
+        # Read quotations from local disk if cache is enabled
+        cache = None
+        if self.Cache.get("Enabled", False):
+            cache = QuotationCache(
+                **{key: value for key, value in self.Cache.items() if key != "Enabled"}
+            )
+
+        # Quotations older than same period last year of the longest time period are not needed
+        streamFromDate = None
+        if self.StreamQuotation and cache is None:
+            streamFromDate = getEarliestNeededDate(max(self.TimePeriods))
+            if self.SeasonalYears > 1:
+                # seasonal windows reach provided number of years back
+                streamFromDate = min(
+                    streamFromDate, getEarliestNeededDate(self.TimePeriods[0], self.SeasonalYears)
+                )
+            if len(self.Lags) > 0:
+                # change over each lag compares with quotation older than window start
+                streamFromDate = streamFromDate.subtract(days=max(self.Lags))
+
+        # All downloads share one keep-alive session, so connections to API are reused between funds
+        with createHTTPSession(self.MaxConcurrency) as session:
+
+            def createFund(url: str) -> Fund:
+                if url in self.LoadedFunds:
+                    return self.LoadedFunds[url]
+                return Fund(
+                    URL=url,
+                    TimePeriodInMonths=self.TimePeriods[0],
+                    Session=session,
+                    DownloadedQuotation=self.DownloadedQuotations.get(url),
+                    Cache=cache,
+                    StreamFromDate=streamFromDate
+                )
+
+            # Download funds one after another if parallel mode is not enabled
+            if self.MaxConcurrency <= 1 or len(self.URLs) <= 1:
+                funds = [createFund(url) for url in self.URLs]
+            else:
+                # Bounded worker pool, map returns results in the same order as URLs
+                workers = min(self.MaxConcurrency, len(self.URLs))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    funds = list(executor.map(createFund, self.URLs))
+
+        # Assign funds in URL order
+        for fund in funds:
+            self.FundsList[getFundIDfromURL(fund.URL)] = fund
 
-        # if provided period is less than 1 year calculate data from same period of last year
-        if self.TimePeriodInMonths <= 12:
-            self.calculateSummaryDetails(
-                self.LastYearDataToPlots, self.LastYearSummary)
         return None
 
-    def prepareDataToPlot(self):
+    def prepareDataToPlot(self, TimePeriodInMonths: int | None = None, funds: list[str] | None = None) -> tuple[dict, dict]:
+        if TimePeriodInMonths is None:
+            TimePeriodInMonths = self.TimePeriods[0]
+        if funds is None:
+            funds = list(self.FundsList)
 
         # Prepare keys for plot data
-        self.DataToPlots["Investment Return Rate"] = {}
-        self.LastYearDataToPlots["Investment Return Rate"] = {}
-        self.DataToPlots["Price Volatility"] = {}
-        self.LastYearDataToPlots["Price Volatility"] = {}
+        dataToPlots = {"Investment Return Rate": {}, "Price Volatility": {}}
+        lastYearDataToPlots = {"Investment Return Rate": {}, "Price Volatility": {}}
+        for column in self.getLagColumns():
+            dataToPlots[column] = {}
+            lastYearDataToPlots[column] = {}
 
         # Loop through each fund
-        for fund in self.FundsList:
+        for fund in funds:
 
             # get refund rate day by day
-            refund = self.FundsList[fund].getRefundRateToPlot()
+            refund = self.FundsList[fund].getRefundRateToPlot(TimePeriodInMonths)
             # assign data for actual time period
-            self.DataToPlots["Investment Return Rate"][fund] = refund["Current"]
+            dataToPlots["Investment Return Rate"][fund] = refund["Current"]
             # assign data for same period last year
-            self.LastYearDataToPlots["Investment Return Rate"][fund] = refund["Historical"]
+            lastYearDataToPlots["Investment Return Rate"][fund] = refund["Historical"]
 
             # get price change day by day
-            change = self.FundsList[fund].getChangesToPlot()
+            change = self.FundsList[fund].getChangesToPlot(TimePeriodInMonths)
             # assign data for actual time period
-            self.DataToPlots["Price Volatility"][fund] = change["Current"]
+            dataToPlots["Price Volatility"][fund] = change["Current"]
             # assign data for same period last year
-            self.LastYearDataToPlots["Price Volatility"][fund] = change["Historical"]
+            lastYearDataToPlots["Price Volatility"][fund] = change["Historical"]
+
+            # get price change over each lag, all lags are calculated in one pass
+            if len(self.Lags) == 0:
+                continue
+            windows = self.FundsList[fund].getWindows(TimePeriodInMonths)
+            lagChanges = self.FundsList[fund].getLagChangesToPlot(self.Lags, TimePeriodInMonths)
+            for data, window, changes in (
+                (dataToPlots, windows["Current"], lagChanges["Current"]),
+                (lastYearDataToPlots, windows["History"], lagChanges["Historical"]),
+            ):
+                for i, column in enumerate(self.getLagColumns()):
+                    data[column][fund] = window.withValue(changes[:, i])
+
+        return dataToPlots, lastYearDataToPlots
+
+    def getDataToPlots(self) -> tuple[dict, dict]:
+        # data for plot of the main time period is prepared only when plot is drawn,
+        # so summary only analysis (e.g. --no-plot or Workers > 1) does not prepare it in main process
+        if len(self.DataToPlots) == 0:
+            with profileStage("Prepare data to plot"):
+                self.DataToPlots, self.LastYearDataToPlots = self.prepareDataToPlot()
+        return self.DataToPlots, self.LastYearDataToPlots
+
+    def getLagColumns(self) -> list[str]:
+        return [self.LagColumnFormat.format(lag) for lag in self.Lags]
+
+    def calculateHorizonSummary(self, funds: list[str] | None = None):
+        # Rows of provided funds only are calculated again, the others are kept as they are
+        isPartial = funds is not None
+        if funds is None:
+            funds = list(self.FundsList)
+
+        # Loop through each time period
+        for months in self.TimePeriods:
+            if not isPartial:
+                self.HorizonSummary[months] = {"Current": {}, "LastYear": {}}
+            dataToPlots, lastYearDataToPlots = self.prepareDataToPlot(months, funds)
+
+            # Risk metrics and change over each lag of both timeframes, calculated from quotation of each fund
+            fundMetrics = {}
+            for fund in funds:
+                fundMetrics[fund] = self.FundsList[fund].getRiskMetrics(
+                    months, self.VolatilityWindowInDays, self.RiskFreeRate
+                )
+                if len(self.Lags) == 0:
+                    continue
+                lagChanges = self.FundsList[fund].getLastLagChanges(self.Lags, months)
+                for timeframe, metrics in fundMetrics[fund].items():
+                    metrics.update(zip(self.getLagColumns(), lagChanges[timeframe].tolist()))
+
+            self.calculateSummaryDetails(
+                dataToPlots,
+                self.HorizonSummary[months]["Current"],
+                {fund: metrics["Current"] for fund, metrics in fundMetrics.items()},
+                funds
+            )
+
+            # if provided period is less than 1 year calculate data from same period of last year
+            if months <= 12:
+                self.calculateSummaryDetails(
+                    lastYearDataToPlots,
+                    self.HorizonSummary[months]["LastYear"],
+                    {fund: metrics["Historical"] for fund, metrics in fundMetrics.items()},
+                    funds
+                )
 
         return None
 
-    def calculateSummaryDetails(self, source, destination):
+    def recalculateFunds(self, funds: list[str]):
+        # quotation of provided funds was replaced (Fund.updateQuotation()), only their rows are calculated again
+        with profileStage("Recalculate funds"):
+            # plot data is updated only if it was already prepared
+            if len(self.DataToPlots) > 0:
+                dataToPlots, lastYearDataToPlots = self.prepareDataToPlot(funds=funds)
+                for name in dataToPlots:
+                    self.DataToPlots[name].update(dataToPlots[name])
+                    self.LastYearDataToPlots[name].update(lastYearDataToPlots[name])
+            self.calculateHorizonSummary(funds)
+            if self.SeasonalYears > 0:
+                self.calculateSeasonalSummary(funds)
+
+        # correlation depends on all funds, so it is calculated again on next use
+        self.CorrelationMatrix = {}
+        return None
 
-        # Loop through each fund
+    def calculateSeasonalSummary(self, funds: list[str] | None = None):
+        if funds is None:
+            funds = list(self.FundsList)
+        months = self.TimePeriods[0]
+
+        # current window is compared with windows 1 to SeasonalYears years back
+        today = datetime.date.today()
+        self.SeasonalPeriods = {0: (getWindowDates(today, months)[0], today)}
+        for yearsBack, period in enumerate(getSeasonalWindowDates(today, months, self.SeasonalYears), start=1):
+            self.SeasonalPeriods[yearsBack] = period
+
+        # windows of all funds and years as one list, so metrics of all of them are calculated at once
+        windows = []
+        for fund in funds:
+            windows.append((fund, 0, self.FundsList[fund].getWindows(months)["Current"]))
+            for yearsBack, window in self.FundsList[fund].getSeasonalWindows(months, self.SeasonalYears).items():
+                windows.append((fund, yearsBack, window))
+
+        metrics = calculateSummaryMetrics([
+            self.FundsList[fund].calculateValueChange(1, window, "Day_to_day_%")
+            for fund, _, window in windows
+        ])
+        metrics["Refund"] = calculateWindowRefunds([window.Value for _, _, window in windows])
+        metrics = {name: values.tolist() for name, values in metrics.items()}
+
+        for fund in funds:
+            self.SeasonalSummary[fund] = {}
+        for i, (fund, yearsBack, _) in enumerate(windows):
+            start, end = self.SeasonalPeriods[yearsBack]
+            row = {
+                "Name": self.FundsList[fund].getName(),
+                "ID": self.FundsList[fund].getID(),
+                self.SeasonalPeriodColumn: f"{start} - {end}",
+            }
+            for metric in self.SummaryPercentageColumns:
+                # NaN means there were no changes of given kind or no quotation in the window
+                row[metric] = "--" if math.isnan(metrics[metric][i]) else metrics[metric][i]
+            self.SeasonalSummary[fund][yearsBack] = row
+
+        return None
+
+    def getSeasonalDataToPlot(self) -> dict[str, dict[int, FundSeries]]:
+        # refund rate of each fund in current window and the same window of previous years
+        months = self.TimePeriods[0]
+        dataToPlot = {}
         for fund in self.FundsList:
+            windows = {0: self.FundsList[fund].getWindows(months)["Current"]}
+            windows.update(self.FundsList[fund].getSeasonalWindows(months, self.SeasonalYears))
+            dataToPlot[fund] = {
+                yearsBack: window.withValue(self.FundsList[fund].calculateRefundRate(window))
+                for yearsBack, window in windows.items()
+                if len(window) > 0
+            }
+        return dataToPlot
+
+    def appendQuotations(self, quotations: dict[str, tuple[datetime.date, float]]):
+        # quotations per fund ID, funds without new quotation are not touched
+        for fund, (date, value) in quotations.items():
+            self.FundsList[fund].appendQuotation(date, value)
+            self.updateCurrentSummary(fund)
+        return None
+
+    def slideWindows(self, today: datetime.date | None = None):
+        for fund in self.FundsList:
+            # accumulators are created before sliding, so the first slide is not lost
+            for months in self.TimePeriods:
+                self.FundsList[fund].getAccumulator(months)
+            self.FundsList[fund].slideWindows(today)
+            self.updateCurrentSummary(fund)
+        return None
+
+    def updateCurrentSummary(self, fund: str):
+        for months in self.TimePeriods:
+            summary = self.FundsList[fund].getAccumulator(months).getSummary()
+            for metric, value in summary.items():
+                self.HorizonSummary[months]["Current"][fund][metric] = (
+                    "--" if math.isnan(value) else value
+                )
+        return None
+
+    def calculateSummaryDetails(self, source, destination, fundMetrics=None, funds=None):
+        if funds is None:
+            funds = list(self.FundsList)
+
+        # Calculate metrics of all funds at once
+        with profileStage("Calculate summary metrics"):
+            metrics = calculateSummaryMetrics(
+                [source["Price Volatility"][fund].Value for fund in funds]
+            )
+        metrics = {name: values.tolist() for name, values in metrics.items()}
+
+        # Loop through each fund
+        for i, fund in enumerate(funds):
             # Prepare key for current fund and provide generic data
             destination[fund] = {}
             destination[fund]["Name"] = self.FundsList[fund].getName()
             destination[fund]["ID"] = self.FundsList[fund].getID()
-            destination[fund]["Refund"] = source["Investment Return Rate"][fund]["value"][-1]
-
-            # Init lists for price increases and decreases
-            decrease = []
-            increase = []
-            for value in source["Price Volatility"][fund]["value"]:
-                if value > 0:
-                    increase.append(value)
-                if value < 0:
-                    decrease.append(value)
-
-            # Calculate ratio of increases to decreases
-            destination[fund]["Raise ratio"] = (
-                round((len(increase) / (len(increase) + len(decrease)) * 100), 2)
+            destination[fund]["Refund"] = float(
+                source["Investment Return Rate"][fund].Value[-1]
             )
 
-            # Try to calculate average increase
-            try:
-                destination[fund]["Avg Increase"] = round(
-                    sum(increase) / len(increase), 2
+            for metric in ("Raise ratio", "Avg Increase", "Avg Decrease"):
+                # NaN means there were no changes of given kind, e.g. no increases
+                destination[fund][metric] = (
+                    "--" if math.isnan(metrics[metric][i]) else metrics[metric][i]
                 )
-            except:
-                # in case where there can be division by 0, which means there were no increases
-                destination[fund]["Avg Increase"] = "--"
-            # Try to calculate average decrease
-            try:
-                destination[fund]["Avg Decrease"] = round(
-                    sum(decrease) / len(decrease), 2
-                )
-            except:
-                # in case where there can be division by 0, which means there were no increases
-                destination[fund]["Avg Decrease"] = "--"
+
+            if fundMetrics is None:
+                continue
+            for metric, value in fundMetrics[fund].items():
+                # NaN means metric is undefined, e.g. drawdown is not recovered yet
+                # or there is no quotation older by lag
+                destination[fund][metric] = "--" if math.isnan(value) else value
 
         return None
 
-    def showAnalysisSummary(self, source, title: str):
-        # Init list for result table
-        dataList = []
-        # Loop through each fund in source dict
-        for fund in source:
-            # Append list with values with added % signs and + or -
-            dataList.append(
-                convertNumericToStrPlsMnsSigns(
-                    inputData=source[fund],
-                    columnsExcludedFromSigns=[],
-                    currencyColumnNames=[],
-                    currency="",
-                    percentageColumnNames=[
-                        "Refund", "Raise ratio", "Avg Increase", "Avg Decrease"
-                    ],
-                )
-            )
+    def showAnalysisSummary(self, source, title: str, stream: TextIO | None = None):
+        rows = list(source.values())
+        # stdout is looked up on call, as print() does
+        if stream is None:
+            stream = sys.stdout
+
+        # Rules of signs, % and currency are resolved once per column,
+        # values are formatted column by column and table is written line by line
+        formatter = TableFormatter(
+            Headers=list(rows[-1].keys()),
+            ColumnsExcludedFromSigns=self.RiskColumnsExcludedFromSigns,
+            PercentageColumnNames=self.SummaryPercentageColumns + self.RiskPercentageColumns + self.getLagColumns() + [
+                f"{self.LastYearColumnPrefix}{column}"
+                for column in self.SummaryPercentageColumns
+            ],
+        )
 
-        # Get headers for table
-        dataHeaders = list(source[fund].keys())
-
-        # Print table with title
-        print("\n")
-        print(" ".join(title))
-        print(
-            tabulate(
-                tabular_data=dataList,
-                tablefmt="github",
-                headers=dataHeaders
+        # Write table with title to console or file
+        stream.write("\n\n")
+        stream.write(" ".join(title) + "\n")
+        formatter.writeTable(rows, stream)
+        stream.write("\n\n")
+        return None
+
+    def getSummaryTables(self, funds: list[str] | None = None) -> dict[str, dict[str, dict[str, float | int]]]:
+        summaryTables = {}
+
+        # Many time periods are displayed as one table per time period
+        if len(self.TimePeriods) > 1:
+            for months in self.TimePeriods:
+                summaryTables.update(self.getHorizonSummaryTable(months))
+        else:
+            # If selected period is greater than 12 month skip table for last year
+            if self.TimePeriods[0] <= 12:
+                summaryTables[f"Same {self.TimePeriods[0]} months last year"] = self.LastYearSummary
+
+            # Summary table for current period
+            summaryTables[f"Last {self.TimePeriods[0]} months"] = self.Summary
+
+        if funds is not None:
+            # Only rows of provided funds, tables without them are skipped
+            summaryTables = {
+                title: {fund: summary[fund] for fund in funds if fund in summary}
+                for title, summary in summaryTables.items()
+            }
+            summaryTables = {title: summary for title, summary in summaryTables.items() if len(summary) > 0}
+
+        # Seasonal table has many rows per fund, so it is filtered when it is created
+        if self.SeasonalYears > 0:
+            summaryTables.update(self.getSeasonalSummaryTable(funds))
+
+        return summaryTables
+
+    def getSeasonalSummaryTable(self, funds: list[str] | None = None) -> dict[str, dict[tuple[str, int], dict[str, float | int | str]]]:
+        if funds is None:
+            funds = list(self.FundsList)
+
+        # One row per fund and year, the current period first
+        table = {
+            (fund, yearsBack): row
+            for fund in funds
+            if fund in self.SeasonalSummary
+            for yearsBack, row in self.SeasonalSummary[fund].items()
+        }
+        if len(table) == 0:
+            return {}
+        return {f"Same {self.TimePeriods[0]} months in last {self.SeasonalYears} years": table}
+
+    def getHorizonSummaryTable(self, TimePeriodInMonths: int) -> dict[str, dict[str, dict[str, float | int]]]:
+        current = self.HorizonSummary[TimePeriodInMonths]["Current"]
+        lastYear = self.HorizonSummary[TimePeriodInMonths]["LastYear"]
+
+        # Same period last year is added as additional columns of current period table
+        combined = {}
+        for fund in current:
+            combined[fund] = dict(current[fund])
+            if fund in lastYear:
+                for column in self.SummaryPercentageColumns:
+                    combined[fund][f"{self.LastYearColumnPrefix}{column}"] = lastYear[fund][column]
+
+        title = f"Last {TimePeriodInMonths} months"
+        if len(lastYear) > 0:
+            title += " and same period last year"
+        return {title: combined}
+
+    def showAnalysisTables(self, funds: list[str] | None = None, stream: TextIO | None = None):
+        # Display summary tables in console (or write them to provided stream)
+        for title, summary in self.getSummaryTables(funds).items():
+            self.showAnalysisSummary(summary, title, stream)
+        return None
+
+    def exportSummary(self, outputFormat: str, stream: TextIO | None = None, funds: list[str] | None = None):
+        if stream is None:
+            stream = sys.stdout
+        with profileStage("Format summary"):
+            self.writeSummary(outputFormat, stream, funds)
+        return None
+
+    def writeSummary(self, outputFormat: str, stream: TextIO, funds: list[str] | None = None):
+        summaryTables = self.getSummaryTables(funds)
+
+        if outputFormat == "table":
+            for title, summary in summaryTables.items():
+                self.showAnalysisSummary(summary, title, stream)
+
+        elif outputFormat == "json":
+            # Each table as list of rows under its title
+            json.dump(
+                {title: list(summary.values()) for title, summary in summaryTables.items()},
+                stream,
+                indent=4,
+                ensure_ascii=False
             )
-        )
-        print("\n")
+            stream.write("\n")
+
+        elif outputFormat == "csv":
+            # All tables in one sheet, title of the table is kept in first column,
+            # tables have different columns (e.g. seasonal one), so columns of all of them are collected first
+            fieldnames = {"Period": None}
+            for summary in summaryTables.values():
+                for row in summary.values():
+                    fieldnames.update(dict.fromkeys(row))
+            if len(fieldnames) == 1:
+                return None
+
+            writer = csv.DictWriter(stream, fieldnames=list(fieldnames), lineterminator="\n")
+            writer.writeheader()
+            for title, summary in summaryTables.items():
+                for row in summary.values():
+                    writer.writerow({"Period": title, **row})
+
+        else:
+            raise ValueError(f"Unsupported output format: {outputFormat}")
         return None
 
-    def showAnalysisPyPlot(self):
-        # First of all display summary tables in console
+    def calculateCorrelation(self, TimePeriodInMonths: int | None = None) -> dict:
+        if TimePeriodInMonths is None:
+            TimePeriodInMonths = self.TimePeriods[0]
+
+        # calculated once per time period, on first use only
+        if TimePeriodInMonths in self.CorrelationMatrix:
+            return self.CorrelationMatrix[TimePeriodInMonths]
 
-        # If selected period is greater than 12 month skip displaying table for last year
-        if self.TimePeriodInMonths <= 12:
-            self.showAnalysisSummary(
-                self.LastYearSummary,
-                f"Same {self.TimePeriodInMonths} months last year"
+        with profileStage("Calculate correlation"):
+            windows = [
+                self.FundsList[fund].getWindows(TimePeriodInMonths)["Current"]
+                for fund in self.FundsList
+            ]
+
+            # funds quote on different days, so all of them are aligned to one calendar first
+            calendar, aligned = alignSeries(
+                [window.Date for window in windows],
+                [window.Value for window in windows]
             )
 
-        # Display summary table for current period
-        self.showAnalysisSummary(
-            self.Summary,
-            f"Last {self.TimePeriodInMonths} months"
-        )
+            self.CorrelationMatrix[TimePeriodInMonths] = {
+                "Funds": list(self.FundsList),
+                "Date": calendar,
+                **calculateCorrelationMatrix(aligned),
+            }
+
+        return self.CorrelationMatrix[TimePeriodInMonths]
+
+    def getCorrelationTables(self, TimePeriodInMonths: int | None = None) -> dict[str, dict[str, dict[str, float | str]]]:
+        matrix = self.calculateCorrelation(TimePeriodInMonths)
+        months = self.TimePeriods[0] if TimePeriodInMonths is None else TimePeriodInMonths
+
+        correlationTables = {}
+        for name in ("Correlation", "Covariance"):
+            table = {}
+            for i, fund in enumerate(matrix["Funds"]):
+                # one row per fund, one column per fund ID
+                table[fund] = {"Name": self.FundsList[fund].getName(), "ID": fund}
+                for j, column in enumerate(matrix["Funds"]):
+                    value = float(matrix[name][i, j])
+                    table[fund][column] = (
+                        "--" if math.isnan(value) else round(value, self.CorrelationRoundDigits)
+                    )
+            correlationTables[f"{name} of daily changes in last {months} months"] = table
+
+        return correlationTables
+
+    def exportCorrelation(self, outputFormat: str, stream: TextIO | None = None, TimePeriodInMonths: int | None = None):
+        if stream is None:
+            stream = sys.stdout
+        correlationTables = self.getCorrelationTables(TimePeriodInMonths)
+
+        if outputFormat == "table":
+            for title, table in correlationTables.items():
+                self.showAnalysisSummary(table, title, stream)
+
+        elif outputFormat == "json":
+            json.dump(
+                {title: list(table.values()) for title, table in correlationTables.items()},
+                stream,
+                indent=4,
+                ensure_ascii=False
+            )
+            stream.write("\n")
+
+        elif outputFormat == "csv":
+            writer = None
+            for title, table in correlationTables.items():
+                for row in table.values():
+                    if writer is None:
+                        writer = csv.DictWriter(
+                            stream, fieldnames=["Matrix"] + list(row.keys()), lineterminator="\n"
+                        )
+                        writer.writeheader()
+                    writer.writerow({"Matrix": title, **row})
+
+        else:
+            raise ValueError(f"Unsupported output format: {outputFormat}")
+        return None
 
-        numOfSubPlots = len(self.PlotOrder)
+    def showAnalysisPyPlot(self):
+        # First of all display summary tables in console
+        self.showAnalysisTables()
 
-        # Calculate xticks interval, to prevent overlapping labels on X axis
-        firstPlot = self.PlotOrder[0]["title"]
-        firstFund = list(self.DataToPlots[firstPlot].keys())[0]
-        dataLength = len(self.DataToPlots[firstPlot][firstFund]["date"])
-        xAxisInterval = 1
-        tempLength = dataLength
+        # Then display plot
+        self.showPyPlot()
+        return None
 
-        # Loop until displayed number of X labels will be less than constant desired num of labels
-        while tempLength > self.XaxisDesiredNumOfLabels:
-            xAxisInterval += 1
-            tempLength = dataLength / xAxisInterval
+    def showPyPlot(self):
+        # Imported here, so analysis without plot does not load matplotlib
+        import matplotlib.pyplot as plt
+        from Dependencies.Class_PlotRenderer import PlotRenderer
 
         # Init sub plots with desired size and window title
-        figure, axis = plt.subplots(
-            numOfSubPlots,
+        figure, _ = plt.subplots(
+            len(self.PlotOrder),
             figsize=(self.PlotSize["X"], self.PlotSize["Y"]),
-            num=f"{self.WindowPlotTitle} {self.TimePeriodInMonths} months",
+            num=f"{self.WindowPlotTitle} {self.TimePeriods[0]} months",
         )
 
-        # Define X labels rotation
-        plt.xticks(rotation=self.XaxisLabelRotation)
-        # display labels only on lower subplot
-        plt.gcf().autofmt_xdate()
+        # Draw all points, so zooming in the window shows full detail
+        with profileStage("Draw plot"):
+            PlotRenderer(PointsPerPixel=None).drawAnalysis(figure, self)
 
-        legend = []
+        # Display configured plots
+        plt.show()
+        return None
 
-        # Loop through subplots
-        for i in range(0, numOfSubPlots):
-            # Init local variable to find largest data set on current subplot
-            maxDatasetLength = {"length": 0, "fundID": ""}
-            currentSubPlot = self.PlotOrder[i]["title"]
+    def savePlot(self, filePath: str, renderer=None):
+        # Imported here, so analysis without plot does not load matplotlib
+        from Dependencies.Class_PlotRenderer import PlotRenderer
 
-            # Loop through funds for current subplot
-            for fund in self.DataToPlots[currentSubPlot]:
-                fundName = self.FundsList[fund].getName()
+        # Pass the same renderer to reuse one figure when saving many reports
+        if renderer is None:
+            renderer = PlotRenderer()
+        with profileStage("Draw plot"):
+            renderer.render(self, filePath)
+        return None
 
-                # Add fund data for current subplot
-                axis[i].plot(
-                    self.DataToPlots[currentSubPlot][fund]["date"],
-                    self.DataToPlots[currentSubPlot][fund]["value"],
-                    label=fundName,
-                )
+    def saveUniverse(self, filePath: str):
+        # whole series of all funds, to be loaded later with UniverseFile
+        UniverseStore.save(filePath, self.FundsList.values())
+        return None
 
-                # Check if name for current fund exists in legend, if not add it
-                if fundName not in legend:
-                    legend.append(fundName)
+    def saveSeasonalityPlot(self, filePath: str, renderer=None):
+        # Imported here, so analysis without plot does not load matplotlib
+        from Dependencies.Class_PlotRenderer import PlotRenderer
 
-                # Get length of current data set
-                currentDatasetLength = len(
-                    self.DataToPlots[currentSubPlot][fund]["date"]
-                )
-                # Check if current data set is larger than largest one so far
-                if maxDatasetLength["length"] < currentDatasetLength:
-                    maxDatasetLength["length"] = currentDatasetLength
-                    maxDatasetLength["fundID"] = fund
-
-            # If reference line is set to true, create appropriate data set with desired value
-            if self.ReferenceLine["Visible"] == True:
-                referenceLine = []
-                for val in range(0, maxDatasetLength["length"]):
-                    referenceLine.append(self.ReferenceLine["Value"])
-                # Add reference line to current subplot
-                axis[i].plot(
-                    self.DataToPlots[currentSubPlot][maxDatasetLength["fundID"]]["date"],
-                    referenceLine,
-                    self.ReferenceLine["Color"],
-                )
-            # Set formatter for X axis in current subplot
-            axis[i].xaxis.set_major_formatter(self.PlotDateFormatter)
-            # Set interval for X axis labels in current subplot
-            axis[i].xaxis.set_major_locator(
-                mdates.DayLocator(interval=xAxisInterval))
-            # Add grid line for current subplot
-            axis[i].grid(
-                which=self.PlotGridStyle["which"],
-                color=self.PlotGridStyle["color"],
-                linestyle=self.PlotGridStyle["linestyle"],
-            )
-            # Set plot title and X, Y axis titles
-            axis[i].set_title(currentSubPlot)
-            axis[i].set_xlabel(self.PlotOrder[i]["X_axis_label"])
-            axis[i].set_ylabel(self.PlotOrder[i]["Y_axis_label"])
-
-        # Force 1 legend for each plot
-        lines_labels = [ax.get_legend_handles_labels() for ax in figure.axes]
-        lines, labels = [sum(lol, []) for lol in zip(*lines_labels)]
-        figure.legend(
-            lines,
-            legend,
-            loc=self.LegendLocation,
-            bbox_to_anchor=(0, -0.1, 1, 1),
-            bbox_transform=plt.gcf().transFigure,
-        )
-        # Define position of plots in displayed window
-        plt.subplots_adjust(
-            left=self.PlotOffsetInWindow["left"],
-            right=self.PlotOffsetInWindow["right"],
-            top=self.PlotOffsetInWindow["top"],
-            bottom=self.PlotOffsetInWindow["bottom"],
-        )
-        # Display configured plots
-        plt.show()
+        if self.SeasonalYears <= 0:
+            raise ValueError("SeasonalYears must be greater than 0 to draw seasonality plot")
+        if renderer is None:
+            renderer = PlotRenderer()
+        with profileStage("Draw seasonality plot"):
+            renderer.renderSeasonality(self, filePath)
+        return None
+
+    def saveCorrelationPlot(self, filePath: str, renderer=None):
+        # Imported here, so analysis without plot does not load matplotlib
+        from Dependencies.Class_PlotRenderer import PlotRenderer
+
+        if renderer is None:
+            renderer = PlotRenderer()
+        with profileStage("Draw correlation plot"):
+            renderer.renderCorrelation(self, filePath)
         return None
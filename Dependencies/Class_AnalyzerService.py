@@ -0,0 +1,282 @@
+"""
+.DESCRIPTION
+    Class to run Analyzer as long-running local HTTP service.
+    Fund instances are kept in memory together with their derived columns,
+    so repeated queries for the same funds are answered without downloading or calculating again.
+    Quotations are refreshed in background thread every RefreshIntervalInMinutes.
+    Concurrent requests for fund which is not loaded yet wait for one download,
+    instead of downloading it once per request.
+
+    Endpoints (GET, JSON responses):
+        /funds                                  <- loaded funds with date of their last quotation
+        /summary?url=<URL>&url=<URL>&months=<int>&months=<int>
+                                                <- summary tables, the same as --output json
+        /series?url=<URL>&months=<int>          <- quotation, refund rate and daily change of one fund
+    When url is not provided, URLs from config file are used. When months is not provided,
+    TimePeriodInMonths from config file is used.
+
+    To init the instance of the class you need to provide:
+        - URLs <- list of urls to funds loaded at startup
+        - TimePeriodInMonths <- default time period, int or list of them
+    Optionally:
+        - MaxConcurrency, Cache, RiskFreeRate, VolatilityWindowInDays, Lags <- passed to Analyzer
+        - Host, Port <- address to listen on
+        - RefreshIntervalInMinutes <- how often quotations of loaded funds are downloaded again
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import io
+import json
+import threading
+
+import requests
+
+from Dependencies.Class_Analyzer import Analyzer
+from Dependencies.Class_Fund import Fund
+from Dependencies.Class_QuotationCache import QuotationCache
+from Dependencies.Function_DownloadFundQuotation import (
+    createHTTPSession,
+    downloadFundQuotation,
+)
+
+
+@dataclass(kw_only=True)
+class AnalyzerService:
+    URLs: list[str]
+    TimePeriodInMonths: int | list[int]
+    MaxConcurrency: int = 1
+    Cache: dict[str, str | float | bool] = field(default_factory=dict, repr=False)
+    RiskFreeRate: float = 0.0
+    VolatilityWindowInDays: int = 21
+    Lags: list[int] = field(default_factory=list)
+    Host: str = "127.0.0.1"
+    Port: int = 8080
+    RefreshIntervalInMinutes: float = 15
+
+    TimePeriods: list[int] = field(default_factory=list, init=False, repr=False)
+    Funds: dict[str, Fund] = field(default_factory=dict, init=False, repr=False)
+    Session: requests.Session | None = field(default=None, init=False, repr=False)
+    FundCache: QuotationCache | None = field(default=None, init=False, repr=False)
+    Server: ThreadingHTTPServer | None = field(default=None, init=False, repr=False)
+
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False)
+    _pendingDownloads: dict[str, Future] = field(
+        default_factory=dict, init=False, repr=False)
+    _stopRefresh: threading.Event = field(
+        default_factory=threading.Event, init=False, repr=False)
+
+    def __post_init__(self):
+        self.TimePeriods = Analyzer.getTimePeriods(self.TimePeriodInMonths)
+        self.Session = createHTTPSession(self.MaxConcurrency)
+        if self.Cache.get("Enabled", False):
+            self.FundCache = QuotationCache(
+                **{key: value for key, value in self.Cache.items() if key != "Enabled"}
+            )
+        return None
+
+    def getFund(self, url: str) -> Fund:
+        with self._lock:
+            if url in self.Funds:
+                return self.Funds[url]
+
+            # the first request downloads fund, the next ones wait for its result
+            pendingDownload = self._pendingDownloads.get(url)
+            isOwner = pendingDownload is None
+            if isOwner:
+                pendingDownload = Future()
+                self._pendingDownloads[url] = pendingDownload
+
+        if not isOwner:
+            return pendingDownload.result()
+
+        try:
+            fund = Fund(
+                URL=url,
+                TimePeriodInMonths=self.TimePeriods[0],
+                Session=self.Session,
+                Cache=self.FundCache
+            )
+        except Exception as error:
+            pendingDownload.set_exception(error)
+            raise
+        else:
+            pendingDownload.set_result(fund)
+            with self._lock:
+                self.Funds[url] = fund
+            return fund
+        finally:
+            with self._lock:
+                del self._pendingDownloads[url]
+
+    def getAnalyzer(self, URLs: list[str], TimePeriods: list[int]) -> Analyzer:
+        # funds are taken from memory, so Analyzer only calculates columns not calculated yet
+        return Analyzer(
+            URLs=URLs,
+            TimePeriodInMonths=TimePeriods,
+            LoadedFunds={url: self.getFund(url) for url in URLs},
+            RiskFreeRate=self.RiskFreeRate,
+            VolatilityWindowInDays=self.VolatilityWindowInDays,
+            Lags=self.Lags,
+        )
+
+    def refreshFunds(self):
+        # API is called regardless of cache TTL, disk cache is updated as well
+        refreshCache = None
+        if self.FundCache is not None:
+            refreshCache = QuotationCache(
+                Directory=self.FundCache.Directory,
+                TTLInMinutes=self.FundCache.TTLInMinutes,
+                MaxSizeInMB=self.FundCache.MaxSizeInMB,
+                Refresh=True
+            )
+
+        with self._lock:
+            funds = dict(self.Funds)
+
+        for url, fund in funds.items():
+            try:
+                downloadedQuotation = downloadFundQuotation(
+                    url, fund.TimePeriodInMonths, self.Session, refreshCache
+                )
+            except Exception as error:
+                # previous quotation is still served, next refresh will try again
+                print(f"Refresh of {url} failed: {error}")
+                continue
+
+            # new instance replaces the old one at once, so requests in progress use consistent data
+            refreshedFund = Fund(
+                URL=url,
+                TimePeriodInMonths=fund.TimePeriodInMonths,
+                DownloadedQuotation=downloadedQuotation
+            )
+            with self._lock:
+                self.Funds[url] = refreshedFund
+        return None
+
+    def refreshInBackground(self):
+        while not self._stopRefresh.wait(self.RefreshIntervalInMinutes * 60):
+            self.refreshFunds()
+        return None
+
+    def getSummary(self, URLs: list[str], TimePeriods: list[int]) -> dict:
+        stream = io.StringIO()
+        self.getAnalyzer(URLs, TimePeriods).exportSummary("json", stream)
+        return json.loads(stream.getvalue())
+
+    def getSeries(self, url: str, TimePeriodInMonths: int) -> dict:
+        fund = self.getFund(url)
+        refund = fund.getRefundRateToPlot(TimePeriodInMonths)
+        change = fund.getChangesToPlot(TimePeriodInMonths)
+
+        series = {"ID": fund.getID(), "Name": fund.getName(), "Currency": fund.getCurrency()}
+        for timeframe in ("Current", "Historical"):
+            window = fund.getWindows(TimePeriodInMonths)[
+                "Current" if timeframe == "Current" else "History"
+            ]
+            series[timeframe] = {
+                "Date": window.Date.astype(str).tolist(),
+                "Value": window.Value.tolist(),
+                "RefundRate_%": refund[timeframe].Value.tolist(),
+                "Day_to_day_%": change[timeframe].Value.tolist(),
+            }
+        return series
+
+    def getLoadedFunds(self) -> list[dict]:
+        with self._lock:
+            funds = dict(self.Funds)
+        return [
+            {
+                "URL": url,
+                "ID": fund.getID(),
+                "Name": fund.getName(),
+                "LastQuotationDate": str(fund.Series.Date[-1]) if len(fund.Series) > 0 else None,
+            }
+            for url, fund in funds.items()
+        ]
+
+    def serve(self):
+        # configured funds are loaded before the first request
+        for url in self.URLs:
+            self.getFund(url)
+
+        threading.Thread(target=self.refreshInBackground, daemon=True).start()
+
+        self.Server = ThreadingHTTPServer((self.Host, self.Port), AnalyzerRequestHandler)
+        self.Server.service = self
+        print(f"Serving analysis on http://{self.Host}:{self.Server.server_port}")
+        try:
+            self.Server.serve_forever()
+        finally:
+            self.Server.server_close()
+            self._stopRefresh.set()
+            self.Session.close()
+        return None
+
+    def shutdown(self):
+        # stops serve() called from other thread
+        self._stopRefresh.set()
+        if self.Server is not None:
+            self.Server.shutdown()
+        return None
+
+
+class AnalyzerRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        service: AnalyzerService = self.server.service
+        request = urlparse(self.path)
+        query = parse_qs(request.query)
+
+        try:
+            URLs = query.get("url", service.URLs)
+            TimePeriods = [int(months) for months in query.get("months", [])] or service.TimePeriods
+            if any(months <= 0 for months in TimePeriods):
+                raise ValueError("months must be greater than 0")
+        except ValueError as error:
+            self.sendJSON(400, {"Error": str(error)})
+            return None
+
+        try:
+            if request.path == "/funds":
+                self.sendJSON(200, service.getLoadedFunds())
+            elif request.path == "/summary":
+                self.sendJSON(200, service.getSummary(URLs, TimePeriods))
+            elif request.path == "/series":
+                if len(query.get("url", [])) != 1:
+                    self.sendJSON(400, {"Error": "exactly one url must be provided"})
+                else:
+                    self.sendJSON(200, service.getSeries(URLs[0], TimePeriods[0]))
+            else:
+                self.sendJSON(404, {"Error": f"Unknown endpoint {request.path}"})
+        except Exception as error:
+            # fund could not be downloaded or parsed
+            self.sendJSON(502, {"Error": str(error)})
+        return None
+
+    def sendJSON(self, status: int, content):
+        body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return None
+
+    def log_message(self, format, *args):
+        # requests are not logged to console
+        return None
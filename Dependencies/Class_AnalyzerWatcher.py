@@ -0,0 +1,236 @@
+"""
+.DESCRIPTION
+    Class to run Analyzer in watch mode, analysis is kept in memory and updated every IntervalInMinutes.
+    Each cycle asks API for quotation of each fund with conditional request (ETag / Last-Modified),
+    API answers 304 Not Modified without body if quotation did not change. If API does not support it,
+    unchanged response is recognized by hash of its content and is not decoded.
+    Only funds with changed quotation are calculated again and only their summary rows are displayed.
+    On the next day windows of all funds move, so all of them are calculated again from quotations in memory.
+    Funds which failed are requested again in the next cycle. Analysis is created when quotations of all funds
+    are available, quotations downloaded before are kept until then.
+    Validators of response are stored only when its quotation is kept, so API never answers 304 for quotation
+    which is not in memory.
+
+    Statistics of each cycle (number of checked funds, downloaded, not modified, failed
+    and recalculated ones) are printed to stderr, so stdout keeps summary only (e.g. for json output).
+    Quotations are always requested from API, Cache, StreamQuotation and UniverseFile are not used.
+
+    To init the instance of the class you need to provide:
+        - URLs <- list of urls to funds to watch
+        - TimePeriodInMonths <- int number or list of them, the same as for Analyzer
+    Optionally:
+        - IntervalInMinutes <- time between the end of one cycle and start of the next one
+        - MaxConcurrency, Workers, RiskFreeRate, VolatilityWindowInDays, SeasonalYears, Lags <- passed to Analyzer
+        - OutputFormat <- format of displayed summary: table (default), json or csv
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import datetime
+import sys
+import threading
+import time
+
+import requests
+
+from Dependencies.Class_Analyzer import Analyzer
+from Dependencies.Class_Profiler import profileStage
+from Dependencies.Function_DownloadFundQuotation import (
+    createHTTPSession,
+    downloadFundSeriesIfModified,
+    filterFundSeries,
+    getFundIDfromURL,
+)
+
+
+@dataclass(kw_only=True)
+class AnalyzerWatcher:
+    URLs: list[str]
+    TimePeriodInMonths: int | list[int]
+    IntervalInMinutes: float = 5
+    MaxConcurrency: int = 1
+    Workers: int = 1
+    RiskFreeRate: float = 0.0
+    VolatilityWindowInDays: int = 21
+    SeasonalYears: int = 0
+    Lags: list[int] = field(default_factory=list)
+    OutputFormat: str = "table"
+
+    TimePeriods: list[int] = field(default_factory=list, init=False, repr=False)
+    FundAnalyzer: Analyzer | None = field(default=None, init=False, repr=False)
+    Validators: dict[str, dict[str, str]] = field(default_factory=dict, init=False, repr=False)
+    PendingQuotations: dict[str, tuple[dict, dict[str, str]]] = field(
+        default_factory=dict, init=False, repr=False)
+    Session: requests.Session | None = field(default=None, init=False, repr=False)
+    AnalysisDate: datetime.date | None = field(default=None, init=False, repr=False)
+
+    _stopWatch: threading.Event = field(
+        default_factory=threading.Event, init=False, repr=False)
+
+    def __post_init__(self):
+        self.TimePeriods = Analyzer.getTimePeriods(self.TimePeriodInMonths)
+        self.Session = createHTTPSession(self.MaxConcurrency)
+        return None
+
+    def checkFund(self, url: str) -> tuple[str, dict | None, dict[str, str] | None]:
+        # quotation waiting for analysis is compared with the same validators as the one in analysis
+        validators = self.Validators.get(url)
+        if url in self.PendingQuotations:
+            validators = self.PendingQuotations[url][1]
+
+        try:
+            fundSeries, validators = downloadFundSeriesIfModified(url, self.Session, validators)
+        except Exception as error:
+            # previous quotation is kept, the next cycle will try again
+            print(f"Download of {url} failed: {error}", file=sys.stderr)
+            return "Failed", None, None
+
+        if fundSeries is None:
+            return "NotModified", None, None
+        # validators are returned, not stored, until quotation is kept in memory
+        return "Downloaded", fundSeries, validators
+
+    def runCycle(self) -> tuple[dict[str, int | float], list[str]]:
+        start = time.perf_counter()
+
+        # all funds are checked in parallel, map returns results in the same order as URLs
+        with profileStage("Check funds"):
+            if self.MaxConcurrency <= 1 or len(self.URLs) <= 1:
+                results = [self.checkFund(url) for url in self.URLs]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.MaxConcurrency, len(self.URLs))) as executor:
+                    results = list(executor.map(self.checkFund, self.URLs))
+
+        statuses = [status for status, _, _ in results]
+        downloaded = {
+            url: (fundSeries, validators)
+            for url, (status, fundSeries, validators) in zip(self.URLs, results)
+            if status == "Downloaded"
+        }
+
+        if self.FundAnalyzer is None:
+            recalculated = self.createAnalyzer(downloaded)
+        else:
+            recalculated = self.updateAnalyzer(
+                {getFundIDfromURL(url): fundSeries for url, (fundSeries, _) in downloaded.items()}
+            )
+            # quotations are in analysis now, so API can answer 304 for them
+            for url, (_, validators) in downloaded.items():
+                self.Validators[url] = validators
+
+        statistics = {
+            "Checked": len(self.URLs),
+            "Downloaded": statuses.count("Downloaded"),
+            "NotModified": statuses.count("NotModified"),
+            "Failed": statuses.count("Failed"),
+            "Recalculated": len(recalculated),
+            "DurationInSeconds": round(time.perf_counter() - start, 3),
+        }
+        return statistics, recalculated
+
+    def createAnalyzer(self, downloaded: dict[str, tuple[dict, dict[str, str]]]) -> list[str]:
+        # analysis needs quotations of all funds, downloaded ones wait for the failed ones
+        self.PendingQuotations.update(downloaded)
+        if len(self.PendingQuotations) < len(self.URLs):
+            print(
+                f"Waiting for quotation of {len(self.URLs) - len(self.PendingQuotations)} funds",
+                file=sys.stderr
+            )
+            return []
+
+        self.AnalysisDate = datetime.date.today()
+        self.FundAnalyzer = Analyzer(
+            URLs=self.URLs,
+            TimePeriodInMonths=self.TimePeriodInMonths,
+            Workers=self.Workers,
+            RiskFreeRate=self.RiskFreeRate,
+            VolatilityWindowInDays=self.VolatilityWindowInDays,
+            SeasonalYears=self.SeasonalYears,
+            Lags=self.Lags,
+            DownloadedQuotations={
+                url: filterFundSeries(self.PendingQuotations[url][0], self.TimePeriods[0])
+                for url in self.URLs
+            },
+        )
+
+        # quotations are in analysis now, so API can answer 304 for them
+        for url, (_, validators) in self.PendingQuotations.items():
+            self.Validators[url] = validators
+        self.PendingQuotations = {}
+        return list(self.FundAnalyzer.FundsList)
+
+    def updateAnalyzer(self, downloaded: dict[str, dict]) -> list[str]:
+        fundsList = self.FundAnalyzer.FundsList
+
+        # windows of all funds move on the next day, quotations in memory are used for not changed ones
+        if datetime.date.today() != self.AnalysisDate:
+            self.AnalysisDate = datetime.date.today()
+            for fund in fundsList:
+                downloaded.setdefault(fund, {
+                    "FundID": fundsList[fund].getID(),
+                    "Currency": fundsList[fund].getCurrency(),
+                    "Date": fundsList[fund].Series.Date,
+                    "Value": fundsList[fund].Series.Value,
+                })
+
+        if len(downloaded) == 0:
+            return []
+
+        # series and derived columns of changed funds are replaced, the other funds are not touched
+        for fund, fundSeries in downloaded.items():
+            fundsList[fund].updateQuotation(
+                filterFundSeries(fundSeries, fundsList[fund].TimePeriodInMonths)
+            )
+        recalculated = [fund for fund in fundsList if fund in downloaded]
+        self.FundAnalyzer.recalculateFunds(recalculated)
+        return recalculated
+
+    def showCycle(self, statistics: dict[str, int | float], recalculated: list[str], isFirstCycle: bool):
+        # cycle which created analysis displays all funds, next ones only rows of recalculated funds
+        if len(recalculated) > 0:
+            self.FundAnalyzer.exportSummary(
+                self.OutputFormat, sys.stdout, None if isFirstCycle else recalculated
+            )
+            sys.stdout.flush()
+
+        print(
+            f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S} "
+            f"Checked: {statistics['Checked']}, "
+            f"Downloaded: {statistics['Downloaded']}, "
+            f"Not modified: {statistics['NotModified']}, "
+            f"Failed: {statistics['Failed']}, "
+            f"Recalculated: {statistics['Recalculated']}, "
+            f"took {statistics['DurationInSeconds']} s",
+            file=sys.stderr
+        )
+        return None
+
+    def watch(self):
+        try:
+            while not self._stopWatch.is_set():
+                isFirstCycle = self.FundAnalyzer is None
+                statistics, recalculated = self.runCycle()
+                self.showCycle(statistics, recalculated, isFirstCycle)
+                self._stopWatch.wait(self.IntervalInMinutes * 60)
+        except KeyboardInterrupt:
+            # watch mode is ended with Ctrl+C
+            pass
+        finally:
+            self.Session.close()
+        return None
+
+    def stop(self):
+        # stops watch() called from other thread after current cycle
+        self._stopWatch.set()
+        return None
@@ -8,6 +8,31 @@
         - URL <- url to fund's site on www.Analizy.pl to download the quotation from
         - TimePeriodInMonths <- int number how many quotation months are needed.
     
+    Derived columns (refund rate, day to day, week to week and month to month change) are calculated
+    on first access only and kept until quotation is replaced with updateQuotation().
+    Changes over many lags (e.g. 1, 7, 30, 90, 365 days) are calculated with calculateLagChanges()
+    in one pass over whole series as one dates by lags matrix, windows take their rows of it.
+    
+    Risk metrics (rolling volatility, max drawdown with recovery days, Sharpe and Sortino ratio)
+    are calculated with getRiskMetrics() in one vectorized pass over quotation of each window.
+    
+    New quotations can be added with appendQuotation() in constant time, they update only
+    summary accumulators of current windows (getAccumulator()), windows are moved with slideWindows().
+    Whole series is replaced with the next updateQuotation().
+    
+    Whole downloaded series is kept in Series, Quotation and LastYearQuotation are windows of it.
+    Windows of other time periods are available with getWindows(), they share the series
+    and changes calculated for it, so nothing is downloaded or parsed again.
+    Windows of the same period in each of last N years are available with getSeasonalWindows().
+    Refund between any two dates of the series is returned by refundBetween() without creating a window,
+    refundsBetween() answers many pairs of dates at once.
+    Optionally:
+        - Session <- requests.Session to reuse pooled connections while downloading quotation.
+        - DownloadedQuotation <- already downloaded quotation (e.g. by async engine), download is skipped.
+        - Cache <- QuotationCache instance to read quotation from local disk instead of downloading it.
+        - StreamFromDate <- if provided (and Cache is not), response is decoded while it is being downloaded
+                            and quotations older than this date are not kept at all.
+    
 .NOTES
 
     Version:            1.0
@@ -21,52 +46,144 @@
 
 """
 from dataclasses import dataclass, field
+import datetime
 
-import pendulum
-from dateutil.parser import parse
+import numpy as np
+import requests
+from Dependencies.Class_FundSeries import FundSeries
+from Dependencies.Class_Profiler import profileStage
+from Dependencies.Class_QuotationCache import QuotationCache
+from Dependencies.Class_SummaryAccumulator import SummaryAccumulator
 from Dependencies.Function_DownloadFundQuotation import (
     downloadFundQuotation,
     getFundNameFromURL,
 )
+from Dependencies.Function_DownloadFundQuotation import (
+    getQuotationWindows,
+    getSeasonalWindows,
+    getWindowDates,
+)
+from Dependencies.Function_Calculation import (
+    calculateLagIndex,
+    calculateLagIndexMatrix,
+    calculateChangeFromLagIndex,
+    calculateRefundBetween,
+    findDateRange,
+    sliceLaggedChange,
+    calculateRiskMetrics,
+    roundLikePython,
+    summaryRoundDigits,
+)
 
 global analizyPLwebsiteURL
-global analizyplAPIresponse_QuotationDate
-global analizyplAPIresponse_QuotationValue
 
 analizyPLwebsiteURL = "https://www.analizy.pl/"
-analizyplAPIresponse_QuotationDate = "date"
-analizyplAPIresponse_QuotationValue = "value"
 
 
 @dataclass(kw_only=True)
 class Fund:
     URL: str
     TimePeriodInMonths: int
+    Session: requests.Session | None = field(default=None, repr=False, compare=False)
+    DownloadedQuotation: dict | None = field(default=None, repr=False, compare=False)
+    Cache: QuotationCache | None = field(default=None, repr=False, compare=False)
+    StreamFromDate: datetime.date | None = field(default=None, repr=False, compare=False)
     Name: str = field(init=False)
     ID: str = field(init=False)
     Currency: str = field(init=False)
-    Quotation: list = field(init=False, repr=False)
-    LastYearQuotation: list = field(init=False, repr=False)
-    RefundRate: list[dict[str, str | float]] = field(
-        init=False, default_factory=list)
-    
-    LastYearRefundRate: list[dict[str, str | float]] = field(
-        init=False, default_factory=list)
+    Series: FundSeries = field(init=False, repr=False)
+    Windows: dict[int, dict[str, FundSeries]] = field(
+        init=False, default_factory=dict, repr=False)
+    SeasonalWindows: dict[tuple[int, int], dict[int, FundSeries]] = field(
+        init=False, default_factory=dict, repr=False)
+    Quotation: FundSeries = field(init=False, repr=False)
+    LastYearQuotation: FundSeries = field(init=False, repr=False)
+    Accumulators: dict[int, SummaryAccumulator] = field(
+        init=False, default_factory=dict, repr=False)
+    AppendedQuotation: list[tuple[datetime.date, float]] = field(
+        init=False, default_factory=list, repr=False)
 
     def __post_init__(self):
-        downloadedQuotation = downloadFundQuotation(
-            self.URL, self.TimePeriodInMonths
-        )
+        downloadedQuotation = self.DownloadedQuotation
+        if downloadedQuotation is None:
+            downloadedQuotation = downloadFundQuotation(
+                self.URL, self.TimePeriodInMonths, self.Session, self.Cache, self.StreamFromDate
+            )
 
         self.ID = downloadedQuotation["FundID"]
+        self.Name = getFundNameFromURL(self.URL)
+        self.setQuotation(downloadedQuotation)
+
+    def setQuotation(self, downloadedQuotation: dict):
         self.Currency = downloadedQuotation["Currency"]
+        self.Series = downloadedQuotation["Series"]
+        self.Windows = {self.TimePeriodInMonths: downloadedQuotation["Price"]}
+        self.SeasonalWindows = {}
         self.Quotation = downloadedQuotation["Price"]["Current"]
         self.LastYearQuotation = downloadedQuotation["Price"]["History"]
-        self.Name = getFundNameFromURL(self.URL)
+        # new series contains quotations appended so far
+        self.Accumulators = {}
+        self.AppendedQuotation = []
+        return None
 
-        self.calculateRefundRate(self.Quotation, self.RefundRate)
-        self.calculateRefundRate(self.LastYearQuotation, self.LastYearRefundRate)
-        self.calculateDayToDayChange()
+    def updateQuotation(self, downloadedQuotation: dict):
+        # new series and windows replace old ones, so all derived columns calculated so far are dropped
+        self.setQuotation(downloadedQuotation)
+        return None
+
+    def getWindows(self, TimePeriodInMonths: int) -> dict[str, FundSeries]:
+        # current and same period last year windows of whole series, found once per time period
+        if TimePeriodInMonths not in self.Windows:
+            self.Windows[TimePeriodInMonths] = getQuotationWindows(
+                self.Series, TimePeriodInMonths
+            )
+        return self.Windows[TimePeriodInMonths]
+
+    def getSeasonalWindows(self, TimePeriodInMonths: int, years: int) -> dict[int, FundSeries]:
+        # windows of the same period 1 to years back, found once per time period and number of years
+        if (TimePeriodInMonths, years) not in self.SeasonalWindows:
+            self.SeasonalWindows[(TimePeriodInMonths, years)] = getSeasonalWindows(
+                self.Series, TimePeriodInMonths, years
+            )
+        return self.SeasonalWindows[(TimePeriodInMonths, years)]
+
+    def getAccumulator(self, TimePeriodInMonths: int | None = None) -> SummaryAccumulator:
+        if TimePeriodInMonths is None:
+            TimePeriodInMonths = self.TimePeriodInMonths
+
+        # created from current window once, quotations appended before are added to it
+        if TimePeriodInMonths not in self.Accumulators:
+            window = self.getWindows(TimePeriodInMonths)["Current"]
+            accumulator = SummaryAccumulator.fromSeries(
+                window, self.calculateValueChange(1, window, "Day_to_day_%")
+            )
+            for date, value in self.AppendedQuotation:
+                accumulator.append(date, value)
+            self.Accumulators[TimePeriodInMonths] = accumulator
+        return self.Accumulators[TimePeriodInMonths]
+
+    def appendQuotation(self, date: datetime.date, value: float):
+        # whole series and windows are not changed, only summary accumulators
+        self.AppendedQuotation.append((date, value))
+        for accumulator in self.Accumulators.values():
+            accumulator.append(date, value)
+        return None
+
+    def slideWindows(self, today: datetime.date | None = None):
+        # remove quotations which are older than start of current window on provided day
+        if today is None:
+            today = datetime.date.today()
+        for TimePeriodInMonths, accumulator in self.Accumulators.items():
+            accumulator.slide(getWindowDates(today, TimePeriodInMonths)[0])
+        return None
+
+    def getComputeCounters(self) -> dict[str, dict[str, int]]:
+        # how many times each derived column was calculated for whole series, current and historical timeframe
+        return {
+            "Series": dict(self.Series.ComputeCount),
+            "Current": dict(self.Quotation.ComputeCount),
+            "Historical": dict(self.LastYearQuotation.ComputeCount),
+        }
 
     def getID(self) -> str:
         return self.ID
@@ -78,116 +195,199 @@ class Fund:
         return self.Name
 
     def getQuotation(self, rowID: int = -1) -> float:
-        return float(self.Quotation[rowID][analizyplAPIresponse_QuotationValue])
+        return float(self.Quotation.Value[rowID])
 
     def calculateDayToDayChange(self):
-        self.calculateValueChange(1, self.Quotation, "Day_to_day_%")
-        self.calculateValueChange(1, self.LastYearQuotation, "Day_to_day_%")
+        self.calculateLagColumns({"Day_to_day_%": 1})
         return None
 
     def calculateWeekToWeekChange(self):
-        self.calculateValueChange(7, self.Quotation, "Week_to_week_%")
-        self.calculateValueChange(7, self.LastYearQuotation, "Week_to_week_%")
+        self.calculateLagColumns({"Week_to_week_%": 7})
         return None
 
     def calculateMonthToMonthChange(self):
-        self.calculateValueChange(30, self.Quotation ,"Month_to_month_%")
-        self.calculateValueChange(30, self.LastYearQuotation ,"Month_to_month_%")
+        self.calculateLagColumns({"Month_to_month_%": 30})
+        return None
+
+    def calculateLagColumns(self, columns: dict[str, int]):
+        # all provided lags are calculated in one pass, each lag is set as named column of both windows
+        lags = list(columns.values())
+        for source in (self.Quotation, self.LastYearQuotation):
+            changes = self.calculateLagChanges(lags, source)
+            for i, name in enumerate(columns):
+                if not source.hasColumn(name):
+                    source.setColumn(name, changes[:, i])
         return None
 
-    def calculateValueChange(self, period: int, source, ColumnName=None):
+    def calculateLagChanges(self, lags: list[int], source: FundSeries) -> np.ndarray:
+
+        def calculateColumn(series: FundSeries) -> np.ndarray:
+            # window of whole series takes its rows of matrix calculated once for the whole series
+            if series.Parent is not None:
+                return sliceLaggedChange(
+                    self.calculateLagChanges(lags, series.Parent),
+                    self.getLagIndexMatrix(lags, series.Parent),
+                    slice(series.Offset, series.Offset + len(series))
+                )
+            with profileStage("Calculate lag changes", self.ID):
+                return calculateChangeFromLagIndex(
+                    series.Value, self.getLagIndexMatrix(lags, series)
+                )
+
+        # one row per quotation, one column per lag,
+        # quotations without older one within lag have 0.0
+        return source.getDerivedColumn(
+            f"LagMatrix_{'_'.join(map(str, lags))}_Changes_%", calculateColumn
+        )
+
+    def getLagIndexMatrix(self, lags: list[int], source: FundSeries) -> np.ndarray:
+        # index of the newest quotation older by at least each lag, -1 if there is none,
+        # matrix has own column name, so it is never mistaken for 1-D index of one lag
+        return source.getDerivedColumn(
+            f"LagMatrix_{'_'.join(map(str, lags))}_Index",
+            lambda series: calculateLagIndexMatrix(series.Date, lags)
+        )
+
+    def getLagChangesToPlot(self, lags: list[int], TimePeriodInMonths: int | None = None) -> dict[str, np.ndarray]:
+        # rows of current and historical timeframe taken from matrix of whole series,
+        # so lag as long as the window or longer compares with quotations before window start,
+        # the same as getLastLagChanges()
+        windows = self.getWindows(
+            self.TimePeriodInMonths if TimePeriodInMonths is None else TimePeriodInMonths
+        )
+        changes = self.calculateLagChanges(lags, self.Series)
+        return {
+            timeframe: changes[window.Offset:window.Offset + len(window)]
+            for timeframe, window in (("Current", windows["Current"]), ("Historical", windows["History"]))
+        }
+
+    def getLastLagChanges(self, lags: list[int], TimePeriodInMonths: int | None = None) -> dict[str, np.ndarray]:
+        # change over each lag as of the last quotation of current and historical timeframe,
+        # older quotation can be before window start, NaN if there is none in whole series
+        windows = self.getWindows(
+            self.TimePeriodInMonths if TimePeriodInMonths is None else TimePeriodInMonths
+        )
+        lagIndex = self.getLagIndexMatrix(lags, self.Series)
+
+        lastLagChanges = {}
+        for timeframe, window in (("Current", windows["Current"]), ("Historical", windows["History"])):
+            lastLagChanges[timeframe] = np.full(len(lags), np.nan)
+            if len(window) == 0:
+                continue
+            row = window.Offset + len(window) - 1
+            found = lagIndex[row] >= 0
+            # rounded the same as refund, not the rounded change of each quotation
+            lastLagChanges[timeframe][found] = roundLikePython(
+                ((self.Series.Value[row] / self.Series.Value[lagIndex[row][found]]) - 1) * 100,
+                summaryRoundDigits
+            )
+        return lastLagChanges
+
+    def calculateValueChange(self, period: int, source: FundSeries, ColumnName=None) -> np.ndarray:
 
         if ColumnName == None:
             ColumnName = f"Change_{period}_Days_%"
-        # get the length of passed quotation to iterate through each of them
-        i = len(source)
-        # loop from the last one to the first one
-        while (i:= i - 1) >= 0:
-            # parse current date to datetime
-            currentDate = parse(
-                source[i][analizyplAPIresponse_QuotationDate]
-            )
-            # Iterate starting from next quotation to find the quotation which is older than current one,
-            # within specified period
-            j = i
-            while (j:= j-1) >= 0:
-                # parse date to datetime of currently checked value
-                dateToCheck = parse(
-                    source[j][analizyplAPIresponse_QuotationDate]
+
+        def calculateColumn(series: FundSeries) -> np.ndarray:
+            # window of whole series reuses changes calculated once for the whole series
+            if series.Parent is not None:
+                return sliceLaggedChange(
+                    self.calculateValueChange(period, series.Parent, ColumnName),
+                    self.getLagIndex(period, series.Parent),
+                    slice(series.Offset, series.Offset + len(series))
+                )
+            with profileStage("Calculate value change", self.ID):
+                return calculateChangeFromLagIndex(
+                    series.Value, self.getLagIndex(period, series)
                 )
-                # check if currently check quotation meets the condition to be older than the main one
-                if (currentDate - dateToCheck).days >= period:
-                    # divide the main quotation by the older one to get value change in percentage
-                    # subtract 1 to get profit or loss only, multiply by 100 to get percentage and round 
-                    # after it break inner loop
-                    source[i][ColumnName] = round(
-                        (
-                            (
-                                (
-                                    float(
-                                        source[i][
-                                            analizyplAPIresponse_QuotationValue
-                                        ]
-                                    )
-                                    / float(
-                                        source[j][
-                                            analizyplAPIresponse_QuotationValue
-                                        ]
-                                    )
-                                )
-                                - 1
-                            )
-                            * 100
-                        ),
-                        3,
-                    )
-                    break
-            else:
-                # if inner loop does not found required value set the result of calculation to 0
-                source[i][ColumnName] = 0.0
-        return None
 
-    def calculateRefundRate(self, source, destination):
-        # get the initial value from first quotation price 
-        initialValue = float(source[0]["value"])
-        
-        # loop through each item in source quotation
-        # calculate refund for each quotation comparing to the initial value
-        for item in source:
-            destination.append(
-                {
-                    "date": item["date"],
-                    "RefundRate_%": round(
-                        (((float(item["value"]) / initialValue) - 1) * 100), 2
-                    ),
-                }
+        # find older quotation for all of them in one pass, only on first access to the column,
+        # quotations without older one within specified period have 0.0
+        return source.getDerivedColumn(ColumnName, calculateColumn)
+
+    def getLagIndex(self, period: int, source: FundSeries) -> np.ndarray:
+        # index of the newest quotation older by at least period days, -1 if there is none
+        return source.getDerivedColumn(
+            f"Lag_{period}_Index",
+            lambda series: calculateLagIndex(series.Date, period)
+        )
+
+    def calculateRefundRate(self, source: FundSeries) -> np.ndarray:
+        # calculate refund for each quotation comparing to the initial value,
+        # only on first access to the column
+        return source.getDerivedColumn(
+            "RefundRate_%",
+            lambda series: roundLikePython(
+                ((series.Value / series.Value[0]) - 1) * 100, 2
             )
-        return None
+        )
+
+    def refundBetween(self, startDate, endDate) -> float:
+        # refund from the first quotation not older than start to the last one not newer than end,
+        # the same as refund of window between these dates, NaN if there is no quotation between them
+        rows = findDateRange(self.Series.Date, startDate, endDate)
+        if rows.stop == rows.start:
+            return np.nan
+        return round(
+            ((float(self.Series.Value[rows.stop - 1]) / float(self.Series.Value[rows.start])) - 1) * 100,
+            summaryRoundDigits
+        )
 
-    def getRefundRateToPlot(self) -> dict[str, pendulum.DateTime | float]:
+    def refundsBetween(self, startDates, endDates) -> np.ndarray:
+        # many pairs of dates (e.g. str, datetime.date or datetime64) are resolved in one binary search
+        return calculateRefundBetween(
+            self.Series.Date,
+            self.Series.Value,
+            np.asarray(startDates, dtype="datetime64[D]"),
+            np.asarray(endDates, dtype="datetime64[D]")
+        )
+
+    def getRefundRateToPlot(self, TimePeriodInMonths: int | None = None) -> dict[str, FundSeries]:
         # return refund rates for current and historical timeframe,
         # prepared to be used in pyplot module
+        windows = self.getWindows(
+            self.TimePeriodInMonths if TimePeriodInMonths is None else TimePeriodInMonths
+        )
         return {
-            "Current": {
-                "date": [parse(dates["date"]) for dates in self.RefundRate],
-                "value": [change["RefundRate_%"] for change in self.RefundRate],
-            },
-            "Historical": {
-                "date": [parse(dates["date"]) for dates in self.LastYearRefundRate],
-                "value": [change["RefundRate_%"] for change in self.LastYearRefundRate],
-            }
+            "Current": windows["Current"].withValue(
+                self.calculateRefundRate(windows["Current"])
+            ),
+            "Historical": windows["History"].withValue(
+                self.calculateRefundRate(windows["History"])
+            )
         }
 
-    def getChangesToPlot(self) -> dict[str, pendulum.DateTime | float]:
+    def getChangesToPlot(self, TimePeriodInMonths: int | None = None) -> dict[str, FundSeries]:
         # return price volatility for current and historical timeframe,
         # prepared to be used in pyplot module
+        windows = self.getWindows(
+            self.TimePeriodInMonths if TimePeriodInMonths is None else TimePeriodInMonths
+        )
         return {
-            "Current": {
-                "date": [parse(dates["date"]) for dates in self.Quotation],
-                "value": [change["Day_to_day_%"] for change in self.Quotation],
-            },
-            "Historical": {
-                "date": [parse(dates["date"]) for dates in self.LastYearQuotation],
-                "value": [change["Day_to_day_%"] for change in self.LastYearQuotation],
-            }
+            "Current": windows["Current"].withValue(
+                self.calculateValueChange(1, windows["Current"], "Day_to_day_%")
+            ),
+            "Historical": windows["History"].withValue(
+                self.calculateValueChange(1, windows["History"], "Day_to_day_%")
+            )
         }
+
+    def getRiskMetrics(
+        self,
+        TimePeriodInMonths: int | None = None,
+        VolatilityWindowInDays: int = 21,
+        RiskFreeRate: float = 0.0
+    ) -> dict[str, dict[str, float]]:
+        # return risk metrics for current and historical timeframe
+        windows = self.getWindows(
+            self.TimePeriodInMonths if TimePeriodInMonths is None else TimePeriodInMonths
+        )
+        with profileStage("Calculate risk metrics", self.ID):
+            return {
+                "Current": calculateRiskMetrics(
+                    windows["Current"].Date, windows["Current"].Value, VolatilityWindowInDays, RiskFreeRate
+                ),
+                "Historical": calculateRiskMetrics(
+                    windows["History"].Date, windows["History"].Value, VolatilityWindowInDays, RiskFreeRate
+                )
+            }
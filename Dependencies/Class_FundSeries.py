@@ -0,0 +1,87 @@
+"""
+.DESCRIPTION
+    Class to represent fund's quotation in columnar form.
+    Dates and values are kept in NumPy arrays, every derived value (e.g. day to day change)
+    is kept as an additional named column of the same length.
+    Class uses __slots__, so instances do not carry per-object dict.
+
+    Derived columns are calculated lazily with getDerivedColumn(), on first access only,
+    and kept for the lifetime of the series. Series is not modified in place, Fund.updateQuotation()
+    replaces whole series with its windows, so columns calculated for old quotation are dropped with them.
+    ComputeCount counts how many times each column was calculated.
+
+    To init the instance of the class you need to provide:
+        - Date <- datetime64[D] array of quotation dates sorted ascending
+        - Value <- float64 array of quotation values
+    Optionally:
+        - Columns <- dict of derived columns
+        - Parent, Offset <- series this one is a window of and position of the window in it,
+                            set by getSlice(), so windows can reuse columns calculated for the whole series
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass(slots=True, eq=False)
+class FundSeries:
+    Date: np.ndarray
+    Value: np.ndarray
+    Columns: dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+    ComputeCount: Counter = field(default_factory=Counter, repr=False)
+    Parent: "FundSeries | None" = field(default=None, repr=False)
+    Offset: int = 0
+
+    def __len__(self) -> int:
+        return len(self.Date)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FundSeries):
+            return NotImplemented
+        # derived columns depend only on quotation, so they are not compared
+        return np.array_equal(self.Date, other.Date) and np.array_equal(self.Value, other.Value)
+
+    def setColumn(self, name: str, values: np.ndarray):
+        if len(values) != len(self.Date):
+            raise ValueError(f"Column {name} length does not match series length")
+        self.Columns[name] = values
+        return None
+
+    def getDerivedColumn(self, name: str, calculateColumn: Callable[["FundSeries"], np.ndarray]) -> np.ndarray:
+        # calculate column only on first access, next calls return memoized one
+        if name not in self.Columns:
+            self.setColumn(name, calculateColumn(self))
+            self.ComputeCount[name] += 1
+        return self.Columns[name]
+
+    def hasColumn(self, name: str) -> bool:
+        return name in self.Columns
+
+    def getSlice(self, rows: slice) -> "FundSeries":
+        start, stop, _ = rows.indices(len(self))
+        # slices of NumPy arrays are views, so no quotation is copied,
+        # derived columns are calculated for the window separately
+        return FundSeries(
+            self.Date[start:stop],
+            self.Value[start:stop],
+            Parent=self,
+            Offset=start
+        )
+
+    def withValue(self, values: np.ndarray) -> "FundSeries":
+        # new series sharing dates with the current one, used to pass derived column as plot data
+        return FundSeries(self.Date, values)
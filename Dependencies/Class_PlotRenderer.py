@@ -0,0 +1,235 @@
+"""
+.DESCRIPTION
+    Class to draw Analyzer plots (Price Volatility and Investment Return Rate) to image files,
+    without display and without pyplot, using Agg canvas.
+    All funds of a subplot are drawn as one LineCollection, reference line is drawn with axhline.
+    Long series are downsampled to a few points per pixel, keeping minimum and maximum of each pixel.
+
+    One figure is created and reused for every rendered report, so rendering many reports in a loop
+    does not allocate new figure each time:
+
+        renderer = PlotRenderer()
+        for analyzer in analyzers:
+            analyzer.savePlot(f"{analyzer.TimePeriodInMonths}.png", renderer)
+
+    Correlation matrix of funds is drawn as heatmap with renderCorrelation().
+    Refund rate in the same period of previous years is drawn with renderSeasonality(),
+    one subplot per fund, periods of all years overlaid on days since period start.
+
+    To init the instance of the class you can provide:
+        - DPI <- resolution of saved image
+        - PointsPerPixel <- maximum number of drawn points per horizontal pixel, None disables downsampling
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from dataclasses import dataclass, field
+from itertools import cycle
+
+import numpy as np
+import matplotlib
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from Dependencies.Function_Calculation import downsampleMinMax
+
+
+@dataclass(kw_only=True)
+class PlotRenderer:
+    DPI: int = 100
+    PointsPerPixel: float | None = 2
+
+    CurrentFigure: Figure | None = field(default=None, init=False, repr=False)
+
+    def render(self, analyzer, filePath: str, fileFormat: str | None = None):
+        figure = self.getFigure(analyzer)
+        self.drawAnalysis(figure, analyzer)
+
+        # format is taken from file extension (png, svg, pdf) if it is not provided
+        figure.savefig(filePath, format=fileFormat, dpi=self.DPI)
+        return None
+
+    def renderCorrelation(self, analyzer, filePath: str, fileFormat: str | None = None):
+        matrix = analyzer.calculateCorrelation()
+        numOfFunds = len(matrix["Funds"])
+
+        # heatmap has own figure, so figure of analysis plot can still be reused
+        size = min(max(analyzer.PlotSize["Y"], numOfFunds * 0.3), analyzer.PlotSize["X"])
+        figure = Figure(figsize=(size, size))
+        FigureCanvasAgg(figure)
+        axis = figure.subplots()
+
+        image = axis.imshow(matrix["Correlation"], cmap="RdBu_r", vmin=-1, vmax=1)
+        figure.colorbar(image, ax=axis)
+
+        axis.set_xticks(np.arange(numOfFunds), matrix["Funds"], rotation=analyzer.XaxisLabelRotation)
+        axis.set_yticks(np.arange(numOfFunds), matrix["Funds"])
+        axis.set_title(analyzer.CorrelationPlotTitle)
+
+        figure.savefig(filePath, format=fileFormat, dpi=self.DPI, bbox_inches="tight")
+        return None
+
+    def renderSeasonality(self, analyzer, filePath: str, fileFormat: str | None = None):
+        dataToPlot = analyzer.getSeasonalDataToPlot()
+        numOfFunds = len(dataToPlot)
+
+        # seasonality has own figure, one subplot per fund with shared X axis
+        figure = Figure(figsize=(analyzer.PlotSize["X"], max(analyzer.PlotSize["Y"], numOfFunds * 3)))
+        FigureCanvasAgg(figure)
+        axis = np.atleast_1d(figure.subplots(max(1, numOfFunds), sharex=True))
+
+        # current period is black, previous years are brighter the older they are
+        colormap = matplotlib.colormaps["viridis"]
+        colors = {
+            yearsBack: "k" if yearsBack == 0 else colormap((yearsBack - 1) / max(1, analyzer.SeasonalYears))
+            for yearsBack in analyzer.SeasonalPeriods
+        }
+
+        for i, (fund, windows) in enumerate(dataToPlot.items()):
+            lines = []
+            for yearsBack, series in windows.items():
+                periodStart = np.datetime64(analyzer.SeasonalPeriods[yearsBack][0], "D")
+                lines.append(
+                    np.column_stack(((series.Date - periodStart).astype(np.int64), series.Value))
+                )
+            axis[i].add_collection(
+                LineCollection(lines, colors=[colors[yearsBack] for yearsBack in windows])
+            )
+            axis[i].autoscale_view()
+
+            if analyzer.ReferenceLine["Visible"] == True:
+                axis[i].axhline(analyzer.ReferenceLine["Value"], color=analyzer.ReferenceLine["Color"])
+            axis[i].grid(
+                which=analyzer.PlotGridStyle["which"],
+                color=analyzer.PlotGridStyle["color"],
+                linestyle=analyzer.PlotGridStyle["linestyle"],
+            )
+            axis[i].set_title(analyzer.FundsList[fund].getName())
+            axis[i].set_ylabel(analyzer.PlotOrder[1]["Y_axis_label"])
+        axis[-1].set_xlabel(analyzer.SeasonalPlotXaxisLabel)
+        figure.suptitle(analyzer.SeasonalPlotTitle)
+
+        # One legend with period of each year for all subplots
+        figure.legend(
+            [Line2D([], [], color=color) for color in colors.values()],
+            [f"{start} - {end}" for start, end in analyzer.SeasonalPeriods.values()],
+            loc=analyzer.LegendLocation,
+        )
+
+        figure.savefig(filePath, format=fileFormat, dpi=self.DPI, bbox_inches="tight")
+        return None
+
+    def getFigure(self, analyzer) -> Figure:
+        numOfSubPlots = len(analyzer.PlotOrder)
+
+        # create new figure only if there is none, or it has different number of subplots
+        if self.CurrentFigure is None or len(self.CurrentFigure.axes) != numOfSubPlots:
+            self.CurrentFigure = Figure(figsize=(analyzer.PlotSize["X"], analyzer.PlotSize["Y"]))
+            FigureCanvasAgg(self.CurrentFigure)
+            self.CurrentFigure.subplots(numOfSubPlots)
+        else:
+            # clear content of previous report
+            for axis in self.CurrentFigure.axes:
+                axis.clear()
+            self.CurrentFigure.legends.clear()
+
+        return self.CurrentFigure
+
+    def drawAnalysis(self, figure: Figure, analyzer):
+        axis = figure.axes
+
+        # Define position of plots in displayed window
+        figure.subplots_adjust(
+            left=analyzer.PlotOffsetInWindow["left"],
+            right=analyzer.PlotOffsetInWindow["right"],
+            top=analyzer.PlotOffsetInWindow["top"],
+            bottom=analyzer.PlotOffsetInWindow["bottom"],
+        )
+
+        # Data to plot is prepared on first draw
+        dataToPlots, _ = analyzer.getDataToPlots()
+
+        # Calculate xticks interval, to prevent overlapping labels on X axis
+        firstPlot = analyzer.PlotOrder[0]["title"]
+        dataLength = max(
+            [len(series) for series in dataToPlots[firstPlot].values()], default=0
+        )
+        xAxisInterval = max(1, -(-dataLength // analyzer.XaxisDesiredNumOfLabels))
+
+        # Number of buckets for downsampling, equal to the plot width in pixels
+        numOfBuckets = 0
+        if self.PointsPerPixel is not None:
+            plotWidth = analyzer.PlotOffsetInWindow["right"] - analyzer.PlotOffsetInWindow["left"]
+            numOfBuckets = int(figure.get_figwidth() * self.DPI * plotWidth * self.PointsPerPixel / 4)
+
+        # Each fund has the same color on every subplot
+        colors = [
+            color for color, _ in zip(
+                cycle(matplotlib.rcParams["axes.prop_cycle"].by_key()["color"]),
+                analyzer.FundsList
+            )
+        ]
+
+        # Loop through subplots
+        for i in range(0, len(analyzer.PlotOrder)):
+            currentSubPlot = analyzer.PlotOrder[i]["title"]
+            axis[i].xaxis_date()
+
+            # Add all funds for current subplot as one collection of lines
+            lines = []
+            for fund in dataToPlots[currentSubPlot]:
+                series = dataToPlots[currentSubPlot][fund]
+                rows = downsampleMinMax(series.Value, numOfBuckets)
+                lines.append(
+                    np.column_stack((mdates.date2num(series.Date[rows]), series.Value[rows]))
+                )
+            axis[i].add_collection(LineCollection(lines, colors=colors))
+            axis[i].autoscale_view()
+
+            # Add reference line to current subplot
+            if analyzer.ReferenceLine["Visible"] == True:
+                axis[i].axhline(
+                    analyzer.ReferenceLine["Value"],
+                    color=analyzer.ReferenceLine["Color"],
+                )
+
+            # Set formatter and interval for X axis labels in current subplot
+            axis[i].xaxis.set_major_formatter(
+                mdates.DateFormatter(analyzer.PlotDateFormat))
+            axis[i].xaxis.set_major_locator(
+                mdates.DayLocator(interval=xAxisInterval))
+            # Add grid line for current subplot
+            axis[i].grid(
+                which=analyzer.PlotGridStyle["which"],
+                color=analyzer.PlotGridStyle["color"],
+                linestyle=analyzer.PlotGridStyle["linestyle"],
+            )
+            # Set plot title and X, Y axis titles
+            axis[i].set_title(currentSubPlot)
+            axis[i].set_xlabel(analyzer.PlotOrder[i]["X_axis_label"])
+            axis[i].set_ylabel(analyzer.PlotOrder[i]["Y_axis_label"])
+
+        # display labels only on lower subplot
+        figure.autofmt_xdate(rotation=analyzer.XaxisLabelRotation)
+
+        # One legend for all subplots
+        figure.legend(
+            [Line2D([], [], color=color) for color in colors],
+            [analyzer.FundsList[fund].getName() for fund in analyzer.FundsList],
+            loc=analyzer.LegendLocation,
+            bbox_to_anchor=(0, -0.1, 1, 1),
+            bbox_transform=figure.transFigure,
+        )
+        return None
@@ -0,0 +1,156 @@
+"""
+.DESCRIPTION
+    Class to keep whole quotation series of funds on local disk between program runs.
+    Each fund is stored in a separate binary file (dates as int32 days, values as float64),
+    named after fund category shortcut and fund ID.
+
+    Cached series is used without calling API until it is older than TTLInMinutes,
+    after that API is called and only quotations newer than the last cached date are merged in.
+    When size of cache folder exceeds MaxSizeInMB the least recently used files are removed.
+
+    To init the instance of the class you can provide:
+        - Directory <- folder to store cached series in
+        - TTLInMinutes <- how long cached series is used without calling API
+        - MaxSizeInMB <- maximum size of cache folder
+        - Refresh <- if True API is called for each fund regardless of TTL
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from dataclasses import dataclass, field
+from typing import Callable
+import os
+import threading
+import time
+
+import numpy as np
+
+from Dependencies.Class_Profiler import profileStage
+
+global cacheFileExtension
+
+cacheFileExtension = ".npz"
+
+
+@dataclass(kw_only=True)
+class QuotationCache:
+    Directory: str = "Cache"
+    TTLInMinutes: float = 360
+    MaxSizeInMB: float = 100
+    Refresh: bool = False
+
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False)
+
+    def getFundSeries(self, categoryShortcut: str, fundID: str, downloadSeries: Callable[[], dict]) -> dict:
+        filePath = self.getFilePath(categoryShortcut, fundID)
+        with profileStage("Cache load", fundID):
+            cachedSeries = self.load(filePath)
+
+        # use cached series without calling API if it is still valid
+        if cachedSeries is not None and not self.Refresh and self.isFresh(cachedSeries):
+            return cachedSeries
+
+        fundSeries = downloadSeries()
+        if cachedSeries is not None:
+            fundSeries = self.mergeSeries(cachedSeries, fundSeries)
+
+        with profileStage("Cache save", fundID):
+            self.save(filePath, fundSeries)
+        return fundSeries
+
+    def getFilePath(self, categoryShortcut: str, fundID: str) -> str:
+        return os.path.join(self.Directory, f"{categoryShortcut}_{fundID}{cacheFileExtension}")
+
+    def isFresh(self, fundSeries: dict) -> bool:
+        return (time.time() - fundSeries["DownloadedAt"]) < self.TTLInMinutes * 60
+
+    def mergeSeries(self, cachedSeries: dict, downloadedSeries: dict) -> dict:
+        # take only quotations newer than the last cached one
+        if len(cachedSeries["Date"]) == 0:
+            newRows = slice(0, len(downloadedSeries["Date"]))
+        else:
+            newRows = slice(
+                int(np.searchsorted(
+                    downloadedSeries["Date"], cachedSeries["Date"][-1], side="right")),
+                len(downloadedSeries["Date"])
+            )
+
+        return {
+            "FundID": downloadedSeries["FundID"],
+            "Currency": downloadedSeries["Currency"],
+            "Date": np.concatenate((cachedSeries["Date"], downloadedSeries["Date"][newRows])),
+            "Value": np.concatenate((cachedSeries["Value"], downloadedSeries["Value"][newRows])),
+        }
+
+    def load(self, filePath: str) -> dict | None:
+        if not os.path.isfile(filePath):
+            return None
+        try:
+            with np.load(filePath, allow_pickle=False) as cachedFile:
+                fundSeries = {
+                    "FundID": str(cachedFile["FundID"]),
+                    "Currency": str(cachedFile["Currency"]),
+                    "Date": cachedFile["Date"].astype("datetime64[D]"),
+                    "Value": cachedFile["Value"],
+                    "DownloadedAt": float(cachedFile["DownloadedAt"]),
+                }
+            # mark file as recently used for eviction policy
+            os.utime(filePath)
+        except (OSError, ValueError, KeyError):
+            # corrupted or just evicted file is treated as cache miss and overwritten after download
+            return None
+
+        return fundSeries
+
+    def save(self, filePath: str, fundSeries: dict):
+        fundSeries["DownloadedAt"] = time.time()
+
+        with self._lock:
+            os.makedirs(self.Directory, exist_ok=True)
+
+            # write to temporary file first, so other process never reads half written file
+            temporaryPath = f"{filePath}.{threading.get_ident()}.tmp"
+            with open(temporaryPath, "wb") as cacheFile:
+                np.savez(
+                    cacheFile,
+                    FundID=np.array(fundSeries["FundID"]),
+                    Currency=np.array(fundSeries["Currency"]),
+                    Date=fundSeries["Date"].astype(np.int32),
+                    Value=fundSeries["Value"].astype(np.float64),
+                    DownloadedAt=np.array(fundSeries["DownloadedAt"]),
+                )
+            os.replace(temporaryPath, filePath)
+
+            self.evict()
+        return None
+
+    def evict(self):
+        cachedFiles = []
+        for entry in os.scandir(self.Directory):
+            if entry.is_file() and entry.name.endswith(cacheFileExtension):
+                stat = entry.stat()
+                cachedFiles.append((stat.st_mtime, stat.st_size, entry.path))
+
+        totalSize = sum(size for _, size, _ in cachedFiles)
+        maxSize = self.MaxSizeInMB * 1024 * 1024
+
+        # remove least recently used files until cache fits in limit
+        for _, size, path in sorted(cachedFiles):
+            if totalSize <= maxSize:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            totalSize -= size
+        return None
@@ -0,0 +1,124 @@
+"""
+.DESCRIPTION
+    Class to keep summary of one fund's window (refund, raise ratio, average increase and decrease)
+    up to date when new quotation arrives, without calculating the whole window again.
+
+    Running number and sum of increases and decreases of day to day change are updated
+    when quotation is appended, and when the oldest quotations leave the window after it is slid.
+    The first quotation of the window has no older one within the window, so its change is 0.0,
+    exactly as in calculation of the whole window.
+    Changes are rounded to 3 digits, so their sums are kept as integer number of thousandths
+    and do not drift with many additions and subtractions.
+    Each append and each removed quotation costs constant time.
+
+    To init the instance of the class use fromSeries() with window of fund's quotation
+    and its day to day change, then:
+        - append(date, value) <- adds new quotation, quotation of the same date replaces the last one
+        - slide(startDate) <- removes quotations older than new window start
+        - getSummary() <- returns Refund, Raise ratio, Avg Increase and Avg Decrease
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from collections import deque
+from dataclasses import dataclass, field
+import datetime
+import math
+
+import numpy as np
+
+from Dependencies.Class_FundSeries import FundSeries
+from Dependencies.Function_Calculation import changeRoundDigits, summaryRoundDigits
+
+global changeScale
+
+changeScale = 10 ** changeRoundDigits
+
+
+@dataclass(kw_only=True)
+class SummaryAccumulator:
+    # quotations of the window as (date, value, change in thousandths of %)
+    Rows: deque = field(default_factory=deque, repr=False)
+    NumOfIncreases: int = 0
+    NumOfDecreases: int = 0
+    SumOfIncreases: int = 0
+    SumOfDecreases: int = 0
+
+    @classmethod
+    def fromSeries(cls, window: FundSeries, change: np.ndarray) -> "SummaryAccumulator":
+        accumulator = cls()
+        scaledChange = np.rint(change * changeScale).astype(np.int64).tolist()
+        dates = window.Date.astype(datetime.date).tolist()
+        for row in zip(dates, window.Value.tolist(), scaledChange):
+            accumulator.Rows.append(row)
+            accumulator.addChange(row[2])
+        return accumulator
+
+    def addChange(self, change: int, sign: int = 1):
+        if change > 0:
+            self.NumOfIncreases += sign
+            self.SumOfIncreases += sign * change
+        elif change < 0:
+            self.NumOfDecreases += sign
+            self.SumOfDecreases += sign * change
+        return None
+
+    def append(self, date: datetime.date, value: float):
+        if len(self.Rows) > 0 and date < self.Rows[-1][0]:
+            raise ValueError(f"Quotation of {date} is older than the last one in window")
+
+        # quotation of the same day (e.g. intraday refresh) replaces the last one
+        if len(self.Rows) > 0 and date == self.Rows[-1][0]:
+            _, _, change = self.Rows.pop()
+            self.addChange(change, -1)
+
+        change = 0
+        if len(self.Rows) > 0:
+            change = round(((value / self.Rows[-1][1]) - 1) * 100, changeRoundDigits)
+            change = round(change * changeScale)
+
+        self.Rows.append((date, value, change))
+        self.addChange(change)
+        return None
+
+    def slide(self, startDate: datetime.date):
+        while len(self.Rows) > 0 and self.Rows[0][0] < startDate:
+            self.Rows.popleft()
+            if len(self.Rows) > 0:
+                # new first quotation has no older one within the window, its change becomes 0.0
+                date, value, change = self.Rows[0]
+                self.addChange(change, -1)
+                self.Rows[0] = (date, value, 0)
+        return None
+
+    def getSummary(self) -> dict[str, float]:
+        refund = math.nan
+        if len(self.Rows) > 0:
+            refund = round(((self.Rows[-1][1] / self.Rows[0][1]) - 1) * 100, summaryRoundDigits)
+
+        # NaN means there were no changes of given kind, e.g. no increases
+        raiseRatio = avgIncrease = avgDecrease = math.nan
+        if self.NumOfIncreases + self.NumOfDecreases > 0:
+            raiseRatio = round(
+                self.NumOfIncreases / (self.NumOfIncreases + self.NumOfDecreases) * 100, summaryRoundDigits
+            )
+        if self.NumOfIncreases > 0:
+            avgIncrease = round(self.SumOfIncreases / changeScale / self.NumOfIncreases, summaryRoundDigits)
+        if self.NumOfDecreases > 0:
+            avgDecrease = round(self.SumOfDecreases / changeScale / self.NumOfDecreases, summaryRoundDigits)
+
+        return {
+            "Refund": refund,
+            "Raise ratio": raiseRatio,
+            "Avg Increase": avgIncrease,
+            "Avg Decrease": avgDecrease,
+        }
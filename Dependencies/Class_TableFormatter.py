@@ -0,0 +1,152 @@
+"""
+.DESCRIPTION
+    Class to format summary tables in GitHub markdown format, the same as
+    convertNumericToStrPlsMnsSigns() of each row followed by tabulate(tablefmt="github", disable_numparse=True),
+    byte for byte, but column by column:
+        - sign, percentage and currency rules are resolved once per column, not once per cell
+        - numeric cells of a column are formatted in one pass
+        - table is written to stream line by line, without building one string of the whole table
+
+    Widths of columns are measured as in tabulate, with wcwidth if it is installed,
+    tables with ANSI codes or multiline cells are passed to tabulate.
+
+    To init the instance of the class you need to provide:
+        - Headers <- list of column names
+    Optionally (the same meaning as in convertNumericToStrPlsMnsSigns):
+        - ColumnsExcludedFromSigns
+        - CurrencyColumnNames, Currency
+        - PercentageColumnNames
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from dataclasses import dataclass, field
+from typing import TextIO
+import sys
+
+from tabulate import tabulate
+
+try:
+    from wcwidth import wcswidth
+except ImportError:
+    wcswidth = None
+
+global minColumnPadding
+
+minColumnPadding = 2
+
+
+@dataclass(kw_only=True)
+class ColumnSpec:
+    Name: str
+    Signed: bool
+    Suffix: str
+
+
+@dataclass(kw_only=True)
+class TableFormatter:
+    Headers: list[str]
+    ColumnsExcludedFromSigns: list[str] = field(default_factory=list)
+    CurrencyColumnNames: list[str] = field(default_factory=list)
+    Currency: str = ""
+    PercentageColumnNames: list[str] = field(default_factory=list)
+
+    Columns: list[ColumnSpec] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        # rules of each column are resolved once, currency suffix takes precedence over percentage
+        excluded = set(self.ColumnsExcludedFromSigns)
+        currency = set(self.CurrencyColumnNames)
+        percentage = set(self.PercentageColumnNames)
+
+        for header in self.Headers:
+            suffix = ""
+            if header in currency:
+                suffix = f" {self.Currency}"
+            elif header in percentage:
+                suffix = " %"
+            self.Columns.append(ColumnSpec(Name=header, Signed=header not in excluded, Suffix=suffix))
+        return None
+
+    def formatColumn(self, column: ColumnSpec, values: list) -> list[str]:
+        try:
+            numbers = [float(value) for value in values]
+        except (TypeError, ValueError):
+            # column with text cells is formatted cell by cell
+            return [self.formatCell(column, value) for value in values]
+
+        suffix = column.Suffix
+        if column.Signed:
+            return [
+                f"+{number:4.2f}{suffix}" if number >= 0 else f"{number:4.2f}{suffix}"
+                for number in numbers
+            ]
+        return [f"{number:4.2f}{suffix}" for number in numbers]
+
+    def formatCell(self, column: ColumnSpec, value) -> str:
+        try:
+            number = float(value)
+        except:
+            return value
+        return self.formatColumn(column, [number])[0]
+
+    def formatRows(self, rows: list[dict]) -> list[list[str]]:
+        # each column as list of cells, cells are stripped and None is empty, as in tabulate
+        rowValues = [list(row.values()) for row in rows]
+        columns = []
+        for i, column in enumerate(self.Columns):
+            cells = self.formatColumn(column, [values[i] for values in rowValues])
+            columns.append(["" if cell is None else str(cell).strip() for cell in cells])
+        return columns
+
+    def writeTable(self, rows: list[dict], stream: TextIO | None = None):
+        # stdout is looked up on call, as print() does
+        stream = sys.stdout if stream is None else stream
+        columns = self.formatRows(rows)
+        headers = [str(header).strip() for header in self.Headers]
+
+        # ANSI codes and line breaks are measured differently by tabulate, so it is used for them
+        if any("\x1b" in cell or "\n" in cell for cells in columns for cell in cells):
+            stream.write(
+                tabulate(
+                    tabular_data=[list(row) for row in zip(*columns)],
+                    tablefmt="github",
+                    headers=headers,
+                    disable_numparse=True
+                )
+            )
+            stream.write("\n")
+            return None
+
+        widths = [
+            max([getTextWidth(header) + minColumnPadding] + [getTextWidth(cell) for cell in cells])
+            for header, cells in zip(headers, columns)
+        ]
+
+        stream.write(formatLine(headers, widths))
+        stream.write("|" + "|".join("-" * (width + 2) for width in widths) + "|\n")
+        for row in zip(*columns):
+            stream.write(formatLine(row, widths))
+        return None
+
+
+def getTextWidth(text: str) -> int:
+    if text.isascii() or wcswidth is None:
+        return len(text)
+    return max(wcswidth(text), 0)
+
+
+def formatLine(cells, widths: list[int]) -> str:
+    # text is aligned left, wide characters take more than one position
+    return "|" + "|".join(
+        f" {cell}{' ' * (width - getTextWidth(cell))} " for cell, width in zip(cells, widths)
+    ) + "|\n"
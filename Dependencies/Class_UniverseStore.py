@@ -0,0 +1,170 @@
+"""
+.DESCRIPTION
+    Class to keep quotation series of many funds (fund universe) in one columnar file,
+    opened as memory-mapped arrays, so funds are loaded without downloading, decoding or copying.
+
+    File layout:
+        - magic bytes and length of header
+        - JSON header with metadata of each fund (URL, ID, Name, Currency)
+          and position, type and length of each array in file
+        - Offsets <- int64 array, quotations of fund i are rows Offsets[i]:Offsets[i + 1]
+        - Date <- datetime64[D] array of quotation dates of all funds, one after another
+        - Value <- float64 array of quotation values of all funds, one after another
+    Arrays start at 64 bytes aligned positions.
+
+    Only header is read when file is opened, quotation is read from disk when it is touched
+    and series of each fund are views of memory-mapped arrays:
+
+        UniverseStore.save("Universe.fund", analyzer.FundsList.values())
+        universe = UniverseStore.open("Universe.fund")
+        quotation = universe.getFundQuotation(url, 12)  <- the same as downloadFundQuotation() returns
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from dataclasses import dataclass, field
+from typing import Iterable
+import json
+import os
+import struct
+
+import numpy as np
+
+from Dependencies.Function_DownloadFundQuotation import filterFundSeries
+
+global universeFileMagic
+global universeArrayAlignment
+
+universeFileMagic = b"FUNDUNI1"
+universeArrayAlignment = 64
+
+
+@dataclass(kw_only=True)
+class UniverseStore:
+    FilePath: str
+    Funds: list[dict[str, str]] = field(repr=False)
+    Offsets: np.ndarray = field(repr=False)
+    Date: np.ndarray = field(repr=False)
+    Value: np.ndarray = field(repr=False)
+
+    FundIndex: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.FundIndex = {fund["URL"]: i for i, fund in enumerate(self.Funds)}
+        return None
+
+    def __len__(self) -> int:
+        return len(self.Funds)
+
+    @classmethod
+    def open(cls, filePath: str) -> "UniverseStore":
+        with open(filePath, "rb") as universeFile:
+            if universeFile.read(len(universeFileMagic)) != universeFileMagic:
+                raise ValueError(f"{filePath} is not a fund universe file")
+            (headerLength,) = struct.unpack("<Q", universeFile.read(8))
+            header = json.loads(universeFile.read(headerLength))
+
+        # arrays are mapped, not read, so opening does not depend on number of quotations,
+        # they are used as plain ndarray views, so results of calculations are not memmap instances
+        arrays = {
+            name: np.memmap(
+                filePath,
+                dtype=np.dtype(details["dtype"]),
+                mode="r",
+                offset=details["offset"],
+                shape=(details["length"],)
+            ).view(np.ndarray)
+            for name, details in header["Arrays"].items()
+        }
+
+        return cls(
+            FilePath=filePath,
+            Funds=header["Funds"],
+            Offsets=arrays["Offsets"],
+            Date=arrays["Date"],
+            Value=arrays["Value"],
+        )
+
+    @staticmethod
+    def save(filePath: str, funds: Iterable):
+        funds = list(funds)
+        lengths = np.array([len(fund.Series) for fund in funds], dtype=np.int64)
+        arrays = {
+            "Offsets": np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+            "Date": np.concatenate(
+                [fund.Series.Date for fund in funds] or [np.array([], dtype="datetime64[D]")]
+            ).astype("datetime64[D]"),
+            "Value": np.concatenate(
+                [fund.Series.Value for fund in funds] or [np.array([], dtype=np.float64)]
+            ).astype(np.float64),
+        }
+        header = {
+            "Funds": [
+                {
+                    "URL": fund.URL,
+                    "ID": fund.getID(),
+                    "Name": fund.getName(),
+                    "Currency": fund.getCurrency(),
+                }
+                for fund in funds
+            ],
+            "Arrays": {},
+        }
+
+        # positions of arrays depend on header length, header is encoded until positions stop changing
+        headerLength = 0
+        while True:
+            position = len(universeFileMagic) + 8 + headerLength
+            for name, array in arrays.items():
+                position = -(-position // universeArrayAlignment) * universeArrayAlignment
+                header["Arrays"][name] = {
+                    "dtype": array.dtype.str,
+                    "offset": position,
+                    "length": len(array),
+                }
+                position += array.nbytes
+            encodedHeader = json.dumps(header, ensure_ascii=False).encode("utf-8")
+            if len(encodedHeader) == headerLength:
+                break
+            headerLength = len(encodedHeader)
+
+        # write to temporary file first, so opened universe is never half written
+        temporaryPath = f"{filePath}.tmp"
+        with open(temporaryPath, "wb") as universeFile:
+            universeFile.write(universeFileMagic)
+            universeFile.write(struct.pack("<Q", headerLength))
+            universeFile.write(encodedHeader)
+            for name, array in arrays.items():
+                universeFile.write(b"\0" * (header["Arrays"][name]["offset"] - universeFile.tell()))
+                universeFile.write(array.tobytes())
+        os.replace(temporaryPath, filePath)
+        return None
+
+    def getURLs(self) -> list[str]:
+        return [fund["URL"] for fund in self.Funds]
+
+    def hasFund(self, url: str) -> bool:
+        return url in self.FundIndex
+
+    def getFundSeries(self, url: str) -> dict:
+        i = self.FundIndex[url]
+        rows = slice(int(self.Offsets[i]), int(self.Offsets[i + 1]))
+        # slices of memory-mapped arrays are views, nothing is read until values are used
+        return {
+            "FundID": self.Funds[i]["ID"],
+            "Currency": self.Funds[i]["Currency"],
+            "Date": self.Date[rows],
+            "Value": self.Value[rows],
+        }
+
+    def getFundQuotation(self, url: str, TimePeriodInMonths: int) -> dict:
+        return filterFundSeries(self.getFundSeries(url), TimePeriodInMonths)
@@ -0,0 +1,366 @@
+"""
+.DESCRIPTION
+    Module of vectorized calculations performed on fund's quotation.
+
+    convertToDateArray
+        parses list of dates in "YYYY-MM-DD" format to datetime64 array, once for all calculations
+
+    findDateRange
+        finds slice of sorted dates array between given dates (both inclusive) using binary search
+
+    calculateLagIndex
+        finds for each quotation index of the newest quotation older by at least given number of days
+
+    calculateLagIndexMatrix
+        finds lag index of each quotation for many numbers of days at once, as dates by lags matrix
+
+    calculateLaggedChange
+        calculates percentage change of each quotation comparing to the one older by given number of days
+
+    calculateChangeFromLagIndex
+        calculates percentage change of each quotation comparing to the one pointed by lag index,
+        or by each column of lag index matrix
+
+    sliceLaggedChange
+        takes window of changes calculated for whole series, as if they were calculated for the window only
+
+    stackSeries
+        stacks arrays of different length into one 2-D array padded with NaN
+
+    calculateSummaryMetrics
+        calculates raise ratio, average increase and average decrease of many funds at once
+
+    calculateWindowRefunds
+        calculates refund of many windows at once, from their first and last quotation
+
+    calculateRefundBetween
+        calculates refund between many pairs of dates at once, dates are resolved by binary search
+
+    calculateDailyReturns
+        calculates simple return of each quotation comparing to the previous one
+
+    calculateRollingVolatility
+        calculates annualized volatility of returns in rolling window, using cumulative sums
+
+    calculateDrawdown
+        calculates maximum drawdown and number of days needed to recover from it
+
+    calculateRiskMetrics
+        calculates rolling volatility, maximum drawdown with recovery time, Sharpe and Sortino ratio
+
+    alignSeries
+        aligns quotations of many funds to one calendar of all their dates, filling gaps with previous quotation
+
+    calculateCorrelationMatrix
+        calculates covariance and correlation of daily changes of all pairs of funds with matrix operations
+
+    downsampleMinMax
+        selects indexes of points to draw, keeping first, last, minimum and maximum point of each bucket
+
+    roundLikePython
+        rounds values of array exactly as built-in round() does
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import numpy as np
+
+global changeRoundDigits
+global summaryRoundDigits
+global tradingDaysPerYear
+
+changeRoundDigits = 3
+summaryRoundDigits = 2
+tradingDaysPerYear = 252
+
+
+def convertToDateArray(dates: list[str]) -> np.ndarray:
+    return np.array(dates, dtype="datetime64[D]")
+
+
+def findDateRange(dates: np.ndarray, startDate=None, endDate=None) -> slice:
+    start = 0
+    stop = len(dates)
+    if startDate is not None:
+        start = int(np.searchsorted(dates, np.datetime64(startDate, "D"), side="left"))
+    if endDate is not None:
+        stop = int(np.searchsorted(dates, np.datetime64(endDate, "D"), side="right"))
+
+    return slice(start, max(start, stop))
+
+
+def calculateLagIndex(dates: np.ndarray, period: int) -> np.ndarray:
+    # dates are sorted ascending, so the last date not newer than (date - period) is found by binary search
+    lagIndex = np.searchsorted(dates, dates - np.timedelta64(period, "D"), side="right") - 1
+
+    # quotation can be compared only with older ones, -1 means there is no such quotation
+    return np.minimum(lagIndex, np.arange(len(dates)) - 1)
+
+
+def calculateLagIndexMatrix(dates: np.ndarray, periods: list[int]) -> np.ndarray:
+    # lagged dates of all periods are found in one binary search over the same dates
+    lagDates = dates[:, np.newaxis] - np.asarray(periods, dtype="timedelta64[D]")[np.newaxis, :]
+    lagIndex = np.searchsorted(dates, lagDates.ravel(), side="right").reshape(lagDates.shape) - 1
+
+    # quotation can be compared only with older ones, -1 means there is no such quotation
+    return np.minimum(lagIndex, np.arange(len(dates))[:, np.newaxis] - 1)
+
+
+def calculateLaggedChange(dates: np.ndarray, values: np.ndarray, period: int) -> np.ndarray:
+    return calculateChangeFromLagIndex(values, calculateLagIndex(dates, period))
+
+
+def calculateChangeFromLagIndex(values: np.ndarray, lagIndex: np.ndarray) -> np.ndarray:
+    change = np.zeros(lagIndex.shape, dtype=np.float64)
+    if len(values) == 0:
+        return change
+
+    found = lagIndex >= 0
+    # each column of lag index matrix is compared with the same quotations
+    currentValues = np.broadcast_to(values.reshape((-1,) + (1,) * (lagIndex.ndim - 1)), lagIndex.shape)
+
+    # divide each quotation by the older one, subtract 1 to get profit or loss only,
+    # multiply by 100 to get percentage, quotations without older one stay 0.0
+    change[found] = ((currentValues[found] / values[lagIndex[found]]) - 1) * 100
+
+    return roundLikePython(change, changeRoundDigits)
+
+
+def sliceLaggedChange(change: np.ndarray, lagIndex: np.ndarray, rows: slice) -> np.ndarray:
+    windowChange = change[rows].copy()
+
+    # quotations compared with the one before the window start have no older quotation within the window
+    windowChange[lagIndex[rows] < rows.start] = 0.0
+
+    return windowChange
+
+
+def stackSeries(seriesList: list[np.ndarray]) -> np.ndarray:
+    lengths = np.array([len(series) for series in seriesList], dtype=np.int64)
+    stacked = np.full((len(seriesList), lengths.max(initial=0)), np.nan)
+    if lengths.sum() == 0:
+        return stacked
+
+    # place all values at once, row is the index of series, column is position within it
+    rows = np.repeat(np.arange(len(seriesList)), lengths)
+    columns = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    stacked[rows, columns] = np.concatenate(seriesList)
+
+    return stacked
+
+
+def calculateSummaryMetrics(changes: list[np.ndarray]) -> dict[str, np.ndarray]:
+    # one row per fund, shorter series are padded with NaN which is neither increase nor decrease
+    stacked = stackSeries(changes)
+    increase = stacked > 0
+    decrease = stacked < 0
+
+    numOfIncreases = increase.sum(axis=1)
+    numOfDecreases = decrease.sum(axis=1)
+
+    # changes are rounded to changeRoundDigits, so they are summed exactly as integers,
+    # result does not depend on order of additions (the same as in SummaryAccumulator)
+    changeScale = 10 ** changeRoundDigits
+    scaled = np.rint(np.nan_to_num(stacked) * changeScale).astype(np.int64)
+    sumOfIncreases = np.where(increase, scaled, 0).sum(axis=1)
+    sumOfDecreases = np.where(decrease, scaled, 0).sum(axis=1)
+
+    # division by 0 gives NaN, which means there were no changes of given kind
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raiseRatio = numOfIncreases / (numOfIncreases + numOfDecreases) * 100
+        avgIncrease = sumOfIncreases / changeScale / numOfIncreases
+        avgDecrease = sumOfDecreases / changeScale / numOfDecreases
+
+    return {
+        "Raise ratio": roundLikePython(raiseRatio, summaryRoundDigits),
+        "Avg Increase": roundLikePython(avgIncrease, summaryRoundDigits),
+        "Avg Decrease": roundLikePython(avgDecrease, summaryRoundDigits),
+    }
+
+
+def calculateWindowRefunds(valuesList: list[np.ndarray]) -> np.ndarray:
+    # empty window has NaN refund
+    firstValues = np.array([values[0] if len(values) > 0 else np.nan for values in valuesList], dtype=np.float64)
+    lastValues = np.array([values[-1] if len(values) > 0 else np.nan for values in valuesList], dtype=np.float64)
+
+    # rounded the same as refund rate column of each window
+    return roundLikePython(((lastValues / firstValues) - 1) * 100, summaryRoundDigits)
+
+
+def calculateRefundBetween(dates: np.ndarray, values: np.ndarray, startDates: np.ndarray, endDates: np.ndarray) -> np.ndarray:
+    # quotation is cumulative return itself, so refund between any two rows is the ratio of their values;
+    # the first quotation not older than start and the last one not newer than end, as in findDateRange
+    startIndex = np.searchsorted(dates, startDates, side="left")
+    endIndex = np.searchsorted(dates, endDates, side="right") - 1
+
+    # NaN means there is no quotation between dates
+    refund = np.full(startIndex.shape, np.nan)
+    found = startIndex <= endIndex
+    refund[found] = roundLikePython(
+        ((values[endIndex[found]] / values[startIndex[found]]) - 1) * 100, summaryRoundDigits
+    )
+    return refund
+
+
+def calculateDailyReturns(values: np.ndarray) -> np.ndarray:
+    return np.diff(values) / values[:-1]
+
+
+def calculateRollingVolatility(values: np.ndarray, window: int) -> np.ndarray:
+    volatility = np.full(len(values), np.nan)
+    returns = calculateDailyReturns(values)
+    if window < 2 or len(returns) < window:
+        return volatility
+
+    # sums of each window are differences of cumulative sums, so no window is summed again,
+    # returns are centered first to keep precision of sum of squares
+    centered = returns - returns.mean()
+    sums = np.concatenate(([0.0], np.cumsum(centered)))
+    squaredSums = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    windowSum = sums[window:] - sums[:-window]
+    windowSquaredSum = squaredSums[window:] - squaredSums[:-window]
+
+    variance = np.maximum((windowSquaredSum - windowSum * windowSum / window) / (window - 1), 0.0)
+
+    # value at index i is volatility of window of returns ending at quotation i
+    volatility[window:] = np.sqrt(variance * tradingDaysPerYear) * 100
+    return volatility
+
+
+def calculateDrawdown(dates: np.ndarray, values: np.ndarray) -> tuple[float, float]:
+    if len(values) == 0:
+        return np.nan, np.nan
+
+    # drop of each quotation comparing to the highest quotation so far
+    runningMax = np.maximum.accumulate(values)
+    drawdown = values / runningMax - 1
+    trough = int(np.argmin(drawdown))
+    if drawdown[trough] == 0:
+        return 0.0, 0.0
+
+    # recovery is the first quotation after the lowest point which reaches previous peak again
+    recovered = np.flatnonzero(values[trough:] >= runningMax[trough])
+    recoveryDays = np.nan
+    if len(recovered) > 0:
+        recoveryDays = float((dates[trough + recovered[0]] - dates[trough]).astype(np.int64))
+
+    return drawdown[trough] * 100, recoveryDays
+
+
+def calculateRiskMetrics(dates: np.ndarray, values: np.ndarray, window: int, riskFreeRate: float) -> dict[str, float]:
+    returns = calculateDailyReturns(values)
+    maxDrawdown, recoveryDays = calculateDrawdown(dates, values)
+
+    # yearly risk free rate in percent converted to daily return
+    excessReturns = returns - ((1 + riskFreeRate / 100) ** (1 / tradingDaysPerYear) - 1)
+
+    sharpe = np.nan
+    sortino = np.nan
+    if len(returns) > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = excessReturns.mean() / returns.std(ddof=1) * np.sqrt(tradingDaysPerYear)
+            downsideDeviation = np.sqrt(np.mean(np.minimum(excessReturns, 0.0) ** 2))
+            sortino = excessReturns.mean() / downsideDeviation * np.sqrt(tradingDaysPerYear)
+
+    metrics = np.array([
+        calculateRollingVolatility(values, window)[-1] if len(values) > 0 else np.nan,
+        maxDrawdown,
+        recoveryDays,
+        sharpe,
+        sortino,
+    ], dtype=np.float64)
+    # infinite ratio (no volatility or no decreases) has no meaning in the summary
+    metrics[~np.isfinite(metrics)] = np.nan
+
+    return dict(zip(
+        ("Rolling Volatility", "Max Drawdown", "Recovery days", "Sharpe", "Sortino"),
+        roundLikePython(metrics, summaryRoundDigits).tolist()
+    ))
+
+
+def alignSeries(datesList: list[np.ndarray], valuesList: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    # one calendar with every date quoted by any of the funds
+    calendar = np.unique(np.concatenate(datesList)) if len(datesList) > 0 else np.array([], dtype="datetime64[D]")
+    aligned = np.full((len(calendar), len(datesList)), np.nan)
+
+    for i, (dates, values) in enumerate(zip(datesList, valuesList)):
+        # index of the newest quotation not later than each calendar date,
+        # so days without quotation take previous one, days before the first quotation stay NaN
+        lastQuotation = np.searchsorted(dates, calendar, side="right") - 1
+        quoted = lastQuotation >= 0
+        aligned[quoted, i] = values[lastQuotation[quoted]]
+
+    return calendar, aligned
+
+
+def calculateCorrelationMatrix(aligned: np.ndarray) -> dict[str, np.ndarray]:
+    # daily change in % of each fund (column), NaN before the first quotation of fund
+    changes = np.diff(aligned, axis=0) / aligned[:-1] * 100
+
+    # pairwise statistics over days quoted by both funds, as matrix products of all columns at once
+    quoted = (~np.isnan(changes)).astype(np.float64)
+    changes = np.nan_to_num(changes, nan=0.0)
+
+    numOfDays = quoted.T @ quoted
+    sums = changes.T @ quoted
+    squaredSums = (changes * changes).T @ quoted
+    productSums = changes.T @ changes
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # sums[i, j] is sum of fund i changes on days quoted by fund j as well
+        covariance = (productSums - sums * sums.T / numOfDays) / (numOfDays - 1)
+        variance = squaredSums - sums * sums / numOfDays
+        correlation = (productSums - sums * sums.T / numOfDays) / np.sqrt(variance * variance.T)
+
+    # fund without any change has undefined correlation
+    correlation[~np.isfinite(correlation)] = np.nan
+    covariance[~np.isfinite(covariance)] = np.nan
+
+    return {
+        "Correlation": np.clip(correlation, -1.0, 1.0),
+        "Covariance": covariance,
+    }
+
+
+def downsampleMinMax(values: np.ndarray, numOfBuckets: int) -> np.ndarray:
+    if numOfBuckets <= 0 or len(values) <= numOfBuckets * 4:
+        return np.arange(len(values))
+
+    # split series into equal buckets (last one padded with its last value)
+    bucketSize = -(-len(values) // numOfBuckets)
+    padded = np.concatenate((values, np.full(bucketSize * numOfBuckets - len(values), values[-1])))
+    buckets = padded.reshape(numOfBuckets, bucketSize)
+
+    bucketStart = np.arange(numOfBuckets) * bucketSize
+    selected = np.concatenate((
+        bucketStart,
+        bucketStart + np.argmin(buckets, axis=1),
+        bucketStart + np.argmax(buckets, axis=1),
+        np.minimum(bucketStart + bucketSize - 1, len(values) - 1),
+    ))
+
+    # keep the order of points, so line is drawn the same way as the original one
+    return np.unique(np.minimum(selected, len(values) - 1))
+
+
+def roundLikePython(values: np.ndarray, digits: int) -> np.ndarray:
+    scale = 10.0 ** digits
+    scaled = values * scale
+    rounded = np.round(scaled) / scale
+
+    # np.round may differ from built-in round() only when value is very close to half,
+    # so only those few values are rounded again one by one (flat index works for matrices as well)
+    fraction = np.abs(scaled - np.floor(scaled) - 0.5)
+    for i in np.flatnonzero(fraction < 1e-6):
+        rounded.flat[i] = round(float(values.flat[i]), digits)
+
+    return rounded
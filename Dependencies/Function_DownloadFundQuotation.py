@@ -5,7 +5,37 @@
         - functions related to downloading and filtering fund's quotation
         
     downloadFundQuotation
-        downloads quotations of provided url from www.Analizy.pl
+        downloads quotations of provided url from www.Analizy.pl (or reads them from cache)
+        and filters quotation time frame
+    
+    downloadFundSeries
+        downloads whole quotation series of provided url from www.Analizy.pl
+    
+    downloadFundSeriesStream
+        downloads quotation series of provided url in chunks, keeping only quotations from provided date
+
+    downloadFundSeriesIfModified
+        downloads whole quotation series of provided url only if it changed since previous download,
+        with conditional request (ETag, Last-Modified) and hash of response content
+    
+    createHTTPSession
+        creates keep-alive HTTP session with connection pool to share between downloads
+    
+    getFundQuotationAPIURL
+        builds url to quotation API for provided fund url
+    
+    decodeFundQuotation
+        decodes quotation API response and filters quotation time frame
+    
+    decodeFundSeries
+        decodes quotation API response to whole series of date and value arrays
+    
+    decodeFundSeriesStream
+        decodes quotation API response chunk by chunk, quotation list is parsed item by item
+        and only quotations from provided date are kept
+    
+    filterFundSeries
+        filters quotation time frame of whole series, keeps whole series as well
     
     getFundIDfromURL
         extracts fund ID from provided url
@@ -19,9 +49,33 @@
     getFundCategory
         extracts fund category name from provided url
     
+    convertQuotationToColumns
+        converts list of quotations from API response to sorted date and value arrays
+    
     filterQuotation
         filters quotation time frame
     
+    filterQuotationColumns
+        filters quotation time frame of date and value arrays
+    
+    getQuotationWindows
+        finds current and same period last year windows of whole series
+    
+    getSeasonalWindows
+        finds windows of the same calendar period in each of provided number of previous years
+
+    getEarliestNeededDate
+        calculates start date of same period last year window (or the oldest seasonal window),
+        the oldest quotation used in analysis
+    
+    getWindowDates
+        calculates start of current window and start and end of same period last year window,
+        once per day and time period
+
+    getSeasonalWindowDates
+        calculates start and end of the same period in each of provided number of previous years,
+        once per day, time period and number of years
+    
 .NOTES
 
     Version:            1.0
@@ -35,9 +89,20 @@
 
 """
 import requests
+from requests.adapters import HTTPAdapter
+from typing import Iterable
+import codecs
+import datetime
+import functools
+import hashlib
 import json
+import re
+import numpy as np
 import pendulum
-from dateutil.parser import parse
+
+from Dependencies.Class_FundSeries import FundSeries
+from Dependencies.Class_Profiler import profileStage, addProfileCounter
+from Dependencies.Function_Calculation import convertToDateArray, findDateRange
 
 global analizyplQuotationAPI
 global analizyplAPIresponse_ID
@@ -60,31 +125,250 @@ analizyplAPIresponse_QuotationList = "price"
 analizyplAPIresponse_QuotationDate = "date"
 analizyplAPIresponse_QuotationValue = "value"
 
+global streamChunkSizeInBytes
+global streamQuotationListPattern
+
+streamChunkSizeInBytes = 64 * 1024
+streamQuotationListPattern = re.compile(
+    rf'"{analizyplAPIresponse_QuotationList}"\s*:\s*\['
+)
+
 fundIDpositionInURL = 4
 fundNamePositionInURL = 5
 fundCategoryPositionInURL = 3
 
 
-def downloadFundQuotation(fundURL: str, TimePeriodInMonths: int) -> dict:
+def downloadFundQuotation(
+    fundURL: str,
+    TimePeriodInMonths: int,
+    session: requests.Session = None,
+    cache=None,
+    streamFromDate: datetime.date | None = None
+) -> dict:
 
-    url = f"{analizyplQuotationAPI}/{getFundCategoryShortcut(fundURL)}/{getFundIDfromURL(fundURL)}"
+    # take whole series from local cache if provided, cache calls API only when it is needed
+    if cache is not None:
+        fundSeries = cache.getFundSeries(
+            getFundCategoryShortcut(fundURL),
+            getFundIDfromURL(fundURL),
+            lambda: downloadFundSeries(fundURL, session)
+        )
+    elif streamFromDate is not None:
+        # older quotations are dropped while response is being read
+        fundSeries = downloadFundSeriesStream(fundURL, streamFromDate, session)
+    else:
+        fundSeries = downloadFundSeries(fundURL, session)
 
-    responseContent = requests.get(url).content
+    return filterFundSeries(fundSeries, TimePeriodInMonths)
 
-    decodedJSON = json.loads(responseContent)
 
-    filteredQuotation = filterQuotation(
-        decodedJSON[analizyplAPIresponse_QuotationDetails][0][analizyplAPIresponse_QuotationList],
-        TimePeriodInMonths
-    )
+def downloadFundSeries(fundURL: str, session: requests.Session = None) -> dict:
+
+    url = getFundQuotationAPIURL(fundURL)
+    fundID = getFundIDfromURL(fundURL)
+
+    # reuse pooled connection if session is provided, otherwise open a new one
+    httpClient = session if session is not None else requests
+    with profileStage("Download", fundID):
+        responseContent = httpClient.get(url).content
+    addProfileCounter("BytesDownloaded", len(responseContent), fundID)
+
+    return decodeFundSeries(responseContent)
+
+
+def downloadFundSeriesStream(
+    fundURL: str,
+    startDate: datetime.date,
+    session: requests.Session = None
+) -> dict:
+
+    url = getFundQuotationAPIURL(fundURL)
+    fundID = getFundIDfromURL(fundURL)
+
+    httpClient = session if session is not None else requests
+    with profileStage("Download and decode stream", fundID):
+        with httpClient.get(url, stream=True) as response:
+            fundSeries = decodeFundSeriesStream(
+                response.iter_content(chunk_size=streamChunkSizeInBytes), startDate, fundID
+            )
+
+    return fundSeries
+
+
+def downloadFundSeriesIfModified(
+    fundURL: str,
+    session: requests.Session = None,
+    validators: dict[str, str] | None = None
+) -> tuple[dict | None, dict[str, str]]:
+
+    url = getFundQuotationAPIURL(fundURL)
+    fundID = getFundIDfromURL(fundURL)
+    if validators is None:
+        validators = {}
+
+    # API answers 304 without body if quotation did not change since previous response
+    headers = {}
+    if validators.get("ETag") is not None:
+        headers["If-None-Match"] = validators["ETag"]
+    if validators.get("Last-Modified") is not None:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+
+    httpClient = session if session is not None else requests
+    with profileStage("Download", fundID):
+        response = httpClient.get(url, headers=headers)
+    if response.status_code == 304:
+        addProfileCounter("NotModified", 1, fundID)
+        return None, validators
+    response.raise_for_status()
+    addProfileCounter("BytesDownloaded", len(response.content), fundID)
+
+    # without ETag and Last-Modified unchanged response is recognized by its content
+    newValidators = {
+        "ETag": response.headers.get("ETag"),
+        "Last-Modified": response.headers.get("Last-Modified"),
+        "ContentHash": hashlib.blake2b(response.content, digest_size=16).hexdigest(),
+    }
+    if newValidators["ContentHash"] == validators.get("ContentHash"):
+        addProfileCounter("NotModified", 1, fundID)
+        return None, newValidators
+
+    return decodeFundSeries(response.content), newValidators
+
+
+def getFundQuotationAPIURL(fundURL: str) -> str:
+    return f"{analizyplQuotationAPI}/{getFundCategoryShortcut(fundURL)}/{getFundIDfromURL(fundURL)}"
+
+
+def decodeFundQuotation(responseContent: bytes, TimePeriodInMonths: int) -> dict:
+    return filterFundSeries(decodeFundSeries(responseContent), TimePeriodInMonths)
+
+
+def decodeFundSeries(responseContent: bytes) -> dict:
+
+    with profileStage("Decode"):
+        decodedJSON = json.loads(responseContent)
+
+        dates, values = convertQuotationToColumns(
+            decodedJSON[analizyplAPIresponse_QuotationDetails][0][analizyplAPIresponse_QuotationList]
+        )
+    addProfileCounter("RowsParsed", len(dates), decodedJSON[analizyplAPIresponse_ID])
 
     return {
         "FundID": decodedJSON[analizyplAPIresponse_ID],
         "Currency": decodedJSON[analizyplAPIresponse_Currency],
-        "Price": filteredQuotation
+        "Date": dates,
+        "Value": values
     }
 
 
+def decodeFundSeriesStream(
+    chunks: Iterable[bytes],
+    startDate: datetime.date,
+    fundID: str | None = None
+) -> dict:
+    decoder = json.JSONDecoder()
+    textDecoder = codecs.getincrementaldecoder("utf-8")()
+    firstKeptDate = startDate.isoformat()
+
+    # response without quotation list is kept as text, quotation list is replaced with empty one
+    responseOutsideList = ""
+    buffer = ""
+    isInList = False
+    isListFinished = False
+    keptQuotation = []
+    numOfBytes = 0
+    numOfRows = 0
+
+    for chunk in chunks:
+        numOfBytes += len(chunk)
+        buffer += textDecoder.decode(chunk)
+
+        if not isInList and not isListFinished:
+            listStart = streamQuotationListPattern.search(buffer)
+            if listStart is None:
+                # part of response before quotation list is small, so it is kept until list is found
+                continue
+            responseOutsideList = buffer[:listStart.end()]
+            buffer = buffer[listStart.end():]
+            isInList = True
+
+        if isListFinished:
+            responseOutsideList += buffer
+            buffer = ""
+            continue
+
+        # parse all complete quotations in buffer, incomplete last one waits for the next chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                isListFinished = True
+                break
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+            numOfRows += 1
+            # dates in "YYYY-MM-DD" format are compared as text
+            if item[analizyplAPIresponse_QuotationDate] >= firstKeptDate:
+                keptQuotation.append(item)
+
+        if isListFinished:
+            responseOutsideList += buffer[position:]
+            buffer = ""
+        else:
+            buffer = buffer[position:]
+
+    buffer += textDecoder.decode(b"", final=True)
+    if not isListFinished:
+        raise ValueError("Quotation list in API response is incomplete")
+    responseOutsideList += buffer
+
+    decodedJSON = json.loads(responseOutsideList)
+    if decodedJSON[analizyplAPIresponse_QuotationDetails][0][analizyplAPIresponse_QuotationList] != []:
+        raise ValueError("Quotation list is not in the first series of API response")
+
+    addProfileCounter("BytesDownloaded", numOfBytes, fundID)
+    addProfileCounter("RowsParsed", numOfRows, fundID)
+
+    dates, values = convertQuotationToColumns(keptQuotation)
+    return {
+        "FundID": decodedJSON[analizyplAPIresponse_ID],
+        "Currency": decodedJSON[analizyplAPIresponse_Currency],
+        "Date": dates,
+        "Value": values
+    }
+
+
+def filterFundSeries(fundSeries: dict, TimePeriodInMonths: int) -> dict:
+    series = FundSeries(fundSeries["Date"], fundSeries["Value"])
+    with profileStage("Filter", fundSeries["FundID"]):
+        windows = getQuotationWindows(series, TimePeriodInMonths)
+    addProfileCounter(
+        "RowsKept", len(windows["Current"]) + len(windows["History"]), fundSeries["FundID"]
+    )
+    return {
+        "FundID": fundSeries["FundID"],
+        "Currency": fundSeries["Currency"],
+        "Series": series,
+        "Price": windows
+    }
+
+
+def createHTTPSession(maxConnections: int = 1) -> requests.Session:
+    session = requests.Session()
+
+    # keep up to maxConnections open connections to API host, so parallel downloads do not wait for a free one
+    adapter = HTTPAdapter(pool_maxsize=max(1, maxConnections))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
 def getFundIDfromURL(fundURL: str) -> str:
     if not isinstance(fundURL, str):
         raise TypeError("FundURL must be a string")
@@ -113,24 +397,85 @@ def getFundCategory(fundURL) -> str:
     return fundURL.split("/")[fundCategoryPositionInURL]
 
 
-def filterQuotation(quotation, TimePeriodInMonths: int) -> list:
-    startDate = pendulum.now().subtract(months=TimePeriodInMonths).date()
-    currentData = [
-        item for item in quotation
-        if pendulum.from_format(item[analizyplAPIresponse_QuotationDate], "YYYY-MM-DD").date() >= startDate
-    ]
+def convertQuotationToColumns(quotation: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    # parse each date and value only once
+    dates = convertToDateArray(
+        [item[analizyplAPIresponse_QuotationDate] for item in quotation]
+    )
+    values = np.array(
+        [item[analizyplAPIresponse_QuotationValue] for item in quotation],
+        dtype=np.float64
+    )
 
-    historicalStartDate = startDate.subtract(years=1)
-    historicalEndDate = historicalStartDate.add(months=TimePeriodInMonths)
+    # binary search requires dates sorted ascending
+    if len(dates) > 1 and np.any(dates[1:] < dates[:-1]):
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        values = values[order]
 
-    historicalData = [
-        item for item in quotation
-        if pendulum.from_format(item[analizyplAPIresponse_QuotationDate], "YYYY-MM-DD").date() >= historicalStartDate and
-        pendulum.from_format(
-            item[analizyplAPIresponse_QuotationDate], "YYYY-MM-DD").date() <= historicalEndDate
-    ]
+    return dates, values
 
+
+def filterQuotation(quotation, TimePeriodInMonths: int) -> dict:
+    return filterQuotationColumns(
+        *convertQuotationToColumns(quotation), TimePeriodInMonths
+    )
+
+
+def filterQuotationColumns(dates: np.ndarray, values: np.ndarray, TimePeriodInMonths: int) -> dict:
+    return getQuotationWindows(FundSeries(dates, values), TimePeriodInMonths)
+
+
+def getQuotationWindows(series: FundSeries, TimePeriodInMonths: int) -> dict[str, FundSeries]:
+    startDate, historicalStartDate, historicalEndDate = getWindowDates(
+        datetime.date.today(), TimePeriodInMonths
+    )
+
+    # both time frames are windows of the same series, found by binary search
+    return {
+        "Current": series.getSlice(findDateRange(series.Date, startDate)),
+        "History": series.getSlice(
+            findDateRange(series.Date, historicalStartDate, historicalEndDate)
+        )
+    }
+
+
+def getSeasonalWindows(series: FundSeries, TimePeriodInMonths: int, years: int) -> dict[int, FundSeries]:
+    windowDates = getSeasonalWindowDates(datetime.date.today(), TimePeriodInMonths, years)
+
+    # bounds of all windows found in one binary search, windows are views of the same series
+    starts = np.searchsorted(
+        series.Date, np.array([start for start, _ in windowDates], dtype="datetime64[D]"), side="left"
+    )
+    stops = np.searchsorted(
+        series.Date, np.array([end for _, end in windowDates], dtype="datetime64[D]"), side="right"
+    )
     return {
-        "Current": currentData,
-        "History": historicalData
+        yearsBack: series.getSlice(slice(int(start), int(max(start, stop))))
+        for yearsBack, start, stop in zip(range(1, years + 1), starts, stops)
     }
+
+
+def getEarliestNeededDate(TimePeriodInMonths: int, years: int = 1) -> pendulum.Date:
+    if years > 1:
+        return getSeasonalWindowDates(datetime.date.today(), TimePeriodInMonths, years)[-1][0]
+    return getWindowDates(datetime.date.today(), TimePeriodInMonths)[1]
+
+
+@functools.lru_cache(maxsize=64)
+def getWindowDates(today: datetime.date, TimePeriodInMonths: int) -> tuple[pendulum.Date, pendulum.Date, pendulum.Date]:
+    # the same for all funds analyzed on given day, so month arithmetic is not repeated per fund
+    startDate = pendulum.date(today.year, today.month, today.day).subtract(months=TimePeriodInMonths)
+    historicalStartDate = startDate.subtract(years=1)
+    historicalEndDate = historicalStartDate.add(months=TimePeriodInMonths)
+    return startDate, historicalStartDate, historicalEndDate
+
+
+@functools.lru_cache(maxsize=64)
+def getSeasonalWindowDates(today: datetime.date, TimePeriodInMonths: int, years: int) -> tuple[tuple[pendulum.Date, pendulum.Date], ...]:
+    # window of k years back starts k years before current window, for k = 1 it is same period last year
+    startDate = getWindowDates(today, TimePeriodInMonths)[0]
+    return tuple(
+        (startDate.subtract(years=yearsBack), startDate.subtract(years=yearsBack).add(months=TimePeriodInMonths))
+        for yearsBack in range(1, years + 1)
+    )
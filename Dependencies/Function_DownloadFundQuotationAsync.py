@@ -0,0 +1,110 @@
+"""
+.DESCRIPTION
+    Module of asyncio counterparts of functions from Function_DownloadFundQuotation,
+    allowing to download many funds on one event loop without blocking it.
+
+    downloadFundQuotationAsync
+        downloads quotations of provided url from www.Analizy.pl, retries failed requests with backoff
+
+    downloadFundsQuotationAsync
+        downloads quotations of all provided urls using one session with per-host connection limit
+
+    createAsyncHTTPSession
+        creates aiohttp session with per-host connection limit and request timeout
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+import asyncio
+
+import aiohttp
+
+from Dependencies.Class_Profiler import addProfileCounter
+from Dependencies.Function_DownloadFundQuotation import (
+    getFundQuotationAPIURL,
+    getFundIDfromURL,
+    decodeFundQuotation,
+)
+
+global defaultConnectionsPerHost
+global defaultTimeoutInSeconds
+global defaultRetries
+global defaultBackoffInSeconds
+global retryableStatusCodes
+
+defaultConnectionsPerHost = 8
+defaultTimeoutInSeconds = 30
+defaultRetries = 3
+defaultBackoffInSeconds = 0.5
+retryableStatusCodes = {429, 500, 502, 503, 504}
+
+
+def createAsyncHTTPSession(
+    connectionsPerHost: int = defaultConnectionsPerHost,
+    timeoutInSeconds: float = defaultTimeoutInSeconds,
+) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(limit_per_host=max(1, connectionsPerHost))
+    timeout = aiohttp.ClientTimeout(total=timeoutInSeconds)
+
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def downloadFundQuotationAsync(
+    fundURL: str,
+    TimePeriodInMonths: int,
+    session: aiohttp.ClientSession,
+    retries: int = defaultRetries,
+    backoffInSeconds: float = defaultBackoffInSeconds,
+) -> dict:
+
+    url = getFundQuotationAPIURL(fundURL)
+
+    attempt = 0
+    while True:
+        try:
+            async with session.get(url) as response:
+                # raise only for errors which may disappear after a while, other responses are decoded as in sync path
+                if response.status in retryableStatusCodes:
+                    response.raise_for_status()
+                responseContent = await response.read()
+            break
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt >= retries:
+                raise
+            # wait exponentially longer after each failed attempt
+            await asyncio.sleep(backoffInSeconds * (2 ** attempt))
+            attempt += 1
+
+    # downloads overlap on one thread, so only counters are collected, not stage timers
+    addProfileCounter("BytesDownloaded", len(responseContent), getFundIDfromURL(fundURL))
+    return decodeFundQuotation(responseContent, TimePeriodInMonths)
+
+
+async def downloadFundsQuotationAsync(
+    fundURLs: list[str],
+    TimePeriodInMonths: int,
+    connectionsPerHost: int = defaultConnectionsPerHost,
+    timeoutInSeconds: float = defaultTimeoutInSeconds,
+    retries: int = defaultRetries,
+    backoffInSeconds: float = defaultBackoffInSeconds,
+) -> list[dict]:
+
+    async with createAsyncHTTPSession(connectionsPerHost, timeoutInSeconds) as session:
+        # gather returns results in the same order as provided urls
+        return await asyncio.gather(
+            *[
+                downloadFundQuotationAsync(
+                    url, TimePeriodInMonths, session, retries, backoffInSeconds
+                )
+                for url in fundURLs
+            ]
+        )
@@ -0,0 +1,142 @@
+"""
+.DESCRIPTION
+    Module of functions to calculate summary of many funds in worker processes.
+    Quotations of all funds are copied once to one shared memory block, workers read them
+    as NumPy views without pickling, and return only summary records of their shard of funds.
+
+    shareFundSeries
+        copies whole series of provided funds to shared memory block
+
+    splitIntoShards
+        splits list of funds into contiguous shards of similar number of quotations
+
+    calculateShardSummary
+        calculates summary of one shard of funds in worker process, reading quotations from shared memory
+
+    calculateHorizonSummaryInWorkers
+        calculates summary of all funds in pool of worker processes and merges it in order of funds
+
+.NOTES
+
+    Version:            1.0
+    Author:             Stanisław Horna
+    Mail:               stanislawhorna@outlook.com
+    GitHub Repository:  https://github.com/StanislawHornaGitHub/Investment_fund_Analyzer
+    Creation Date:      18-Oct-2026
+    ChangeLog:
+
+    Date            Who                     What
+
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Dependencies.Function_DownloadFundQuotation import filterFundSeries
+
+
+def shareFundSeries(funds: list) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    lengths = np.array([len(fund.Series) for fund in funds], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    numOfRows = int(offsets[-1])
+
+    # dates as int64 days and values as float64, one after another
+    block = shared_memory.SharedMemory(create=True, size=max(1, numOfRows * 16))
+    dates = np.ndarray(numOfRows, dtype=np.int64, buffer=block.buf)
+    values = np.ndarray(numOfRows, dtype=np.float64, buffer=block.buf, offset=numOfRows * 8)
+    for fund, start, stop in zip(funds, offsets[:-1], offsets[1:]):
+        dates[start:stop] = fund.Series.Date.astype(np.int64)
+        values[start:stop] = fund.Series.Value
+
+    del dates, values
+    return block, offsets
+
+
+def splitIntoShards(offsets: np.ndarray, numOfShards: int) -> list[slice]:
+    # shard borders at equal number of quotations, not at equal number of funds
+    numOfFunds = len(offsets) - 1
+    borders = np.searchsorted(
+        offsets, np.linspace(0, offsets[-1], numOfShards + 1)[1:-1], side="left"
+    )
+    borders = np.unique(np.concatenate(([0], np.clip(borders, 0, numOfFunds), [numOfFunds])))
+    return [slice(int(start), int(stop)) for start, stop in zip(borders[:-1], borders[1:]) if stop > start]
+
+
+def calculateShardSummary(task: dict) -> dict:
+    # Imported here, because Analyzer module imports this one
+    from Dependencies.Class_Analyzer import Analyzer
+
+    block = shared_memory.SharedMemory(name=task["BlockName"])
+    try:
+        numOfRows = task["NumOfRows"]
+        dates = np.ndarray(numOfRows, dtype=np.int64, buffer=block.buf).view("datetime64[D]")
+        values = np.ndarray(numOfRows, dtype=np.float64, buffer=block.buf, offset=numOfRows * 8)
+
+        downloadedQuotations = {}
+        for fund, start, stop in zip(task["Funds"], task["Offsets"][:-1], task["Offsets"][1:]):
+            downloadedQuotations[fund["URL"]] = filterFundSeries(
+                {
+                    "FundID": fund["ID"],
+                    "Currency": fund["Currency"],
+                    "Date": dates[start:stop],
+                    "Value": values[start:stop],
+                },
+                task["TimePeriods"][0]
+            )
+
+        analyzer = Analyzer(
+            URLs=[fund["URL"] for fund in task["Funds"]],
+            TimePeriodInMonths=task["TimePeriods"],
+            DownloadedQuotations=downloadedQuotations,
+            RiskFreeRate=task["RiskFreeRate"],
+            VolatilityWindowInDays=task["VolatilityWindowInDays"],
+            Lags=task["Lags"],
+        )
+        horizonSummary = analyzer.HorizonSummary
+
+        # views of shared memory must be released before it is closed
+        del analyzer, downloadedQuotations, dates, values
+    finally:
+        block.close()
+
+    return horizonSummary
+
+
+def calculateHorizonSummaryInWorkers(analyzer, workers: int) -> dict:
+    funds = list(analyzer.FundsList.values())
+    block, offsets = shareFundSeries(funds)
+
+    try:
+        tasks = []
+        for shard in splitIntoShards(offsets, workers):
+            tasks.append({
+                "BlockName": block.name,
+                "NumOfRows": int(offsets[-1]),
+                "Offsets": offsets[shard.start:shard.stop + 1].tolist(),
+                "Funds": [
+                    {"URL": fund.URL, "ID": fund.getID(), "Currency": fund.getCurrency()}
+                    for fund in funds[shard]
+                ],
+                "TimePeriods": analyzer.TimePeriods,
+                "RiskFreeRate": analyzer.RiskFreeRate,
+                "VolatilityWindowInDays": analyzer.VolatilityWindowInDays,
+                "Lags": analyzer.Lags,
+            })
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            shardSummaries = list(executor.map(calculateShardSummary, tasks))
+    finally:
+        block.close()
+        block.unlink()
+
+    # shards are contiguous and returned in order, so merged summary keeps order of funds
+    horizonSummary = {
+        months: {"Current": {}, "LastYear": {}} for months in analyzer.TimePeriods
+    }
+    for shardSummary in shardSummaries:
+        for months, summary in shardSummary.items():
+            horizonSummary[months]["Current"].update(summary["Current"])
+            horizonSummary[months]["LastYear"].update(summary["LastYear"])
+
+    return horizonSummary
@@ -47,8 +47,25 @@ def getConfiguration(options):
     with open(configFilePath,"r") as configFile:
         configuration = json.loads("\n".join(configFile.readlines()))
         
-    if options.Time_Period_In_Months != None and options.Time_Period_In_Months > 0:
-        configuration["TimePeriodInMonths"] = options.Time_Period_In_Months
+    if options.Time_Period_In_Months != None:
+        timePeriods = [period for period in options.Time_Period_In_Months if period > 0]
+        if len(timePeriods) == 1:
+            configuration["TimePeriodInMonths"] = timePeriods[0]
+        elif len(timePeriods) > 1:
+            configuration["TimePeriodInMonths"] = timePeriods
+
+    if options.Seasonal_Years != None:
+        configuration["SeasonalYears"] = options.Seasonal_Years
+    if options.Lags != None:
+        configuration["Lags"] = [lag for lag in options.Lags if lag > 0]
+    if options.Workers != None:
+        configuration["Workers"] = options.Workers
+    if options.Universe != None:
+        configuration["UniverseFile"] = options.Universe
+    if options.No_Cache:
+        configuration.setdefault("Cache", {})["Enabled"] = False
+    if options.Refresh:
+        configuration.setdefault("Cache", {})["Refresh"] = True
     return configuration
 
 def checkIfConfigFileExists():
@@ -5,7 +5,10 @@
         - Refund
         - Rise ratio
         - Avg Increase
-        - Avg Decrease.
+        - Avg Decrease
+        - Rolling Volatility
+        - Max Drawdown and Recovery days
+        - Sharpe and Sortino ratio.
     Each described param will be calculated for current period and same time last year.
 
 .DESCRIPTION
@@ -17,16 +20,73 @@
             "<URL_To_Fund_3>",
             "<URL_To_Fund_4>"
         ],
-        "TimePeriodInMonths": <int>
+        "TimePeriodInMonths": <int> | [<int>, <int>, ...],
+        "MaxConcurrency": <int>,
+        "Workers": <int>,
+        "StreamQuotation": <bool>,
+        "UniverseFile": "<path>",
+        "RiskFreeRate": <float>,
+        "VolatilityWindowInDays": <int>,
+        "SeasonalYears": <int>,
+        "Lags": [<int>, <int>, ...],
+        "Cache": {
+            "Enabled": <bool>,
+            "Directory": "<path>",
+            "TTLInMinutes": <int>,
+            "MaxSizeInMB": <int>
+        },
+        "Server": {
+            "Host": "<address>",
+            "Port": <int>,
+            "RefreshIntervalInMinutes": <int>
+        }
     }
     
     URLs <- list of URL to funds which will be checked
-    TimePeriodInMonths <- time period to analyze passed as int
+    TimePeriodInMonths <- time period to analyze passed as int, or list of them
+                          to analyze many time periods from one download (one table per time period)
+    MaxConcurrency <- number of funds downloaded in parallel, 1 downloads one after another
+    Workers <- number of processes summary is calculated in, 1 calculates it in main process
+    StreamQuotation <- decodes quotation while it is downloaded and keeps only quotations needed for analysis,
+                       used when cache is disabled (cache keeps whole series)
+    UniverseFile <- file with quotations of many funds saved with --save-universe, funds are loaded from it
+                    without downloading, if URLs list is empty all funds from the file are analyzed
+    RiskFreeRate <- yearly risk free rate in % used to calculate Sharpe and Sortino ratio
+    VolatilityWindowInDays <- number of quotations in rolling window of annualized volatility
+    SeasonalYears <- number of previous years the same period (of the first time period) is compared in,
+                     one additional table with row per fund and year, 0 disables it
+    Lags <- numbers of days to calculate change of quotation over, one summary column (as of the last quotation)
+            and one subplot per lag, empty list disables it
+    Cache <- local quotation cache, series are read from disk until they are older than TTLInMinutes,
+             then only quotations newer than the last cached one are merged in,
+             least recently used series are removed when cache exceeds MaxSizeInMB
+    Server <- address of local HTTP API started with --serve and how often loaded funds are refreshed
     
     
 .INPUTS
-        --Time_Period_In_Months <- replaces time period defined in config file
+        --Time_Period_In_Months <- replaces time period defined in config file, accepts many values
         --Config_File_Name <- Config file name, which must be located in the same dir as executed file
+        --no-cache <- downloads quotations without using local cache
+        --refresh <- downloads quotations regardless of cache TTL and merges them into cache
+        --no-plot <- skips plot, matplotlib is not imported at all
+        --output <- format of summary printed to console: table (default), json or csv
+        --plot-file <- saves plot to file (png, svg or pdf) instead of displaying it
+        --correlation <- prints correlation and covariance matrix of daily changes of funds
+        --correlation-file <- saves correlation matrix heatmap to file (png, svg or pdf)
+        --seasonal-years <- replaces SeasonalYears defined in config file
+        --seasonal-file <- saves refund rate in the same period of previous years to file (png, svg or pdf)
+        --lags <- replaces Lags defined in config file, accepts many values
+        --serve <- runs as local HTTP service answering /funds, /summary and /series queries in JSON,
+                   funds are kept in memory and refreshed in background
+        --port <- replaces port of HTTP service defined in config file
+        --watch <- keeps analysis in memory and checks funds every provided number of minutes,
+                   only funds with changed quotation are downloaded (conditional requests) and calculated again,
+                   their summary rows are displayed with statistics of each cycle, until Ctrl+C
+        --workers <- replaces Workers defined in config file
+        --universe <- replaces UniverseFile defined in config file
+        --save-universe <- saves quotations of all analyzed funds to one memory-mapped file
+        --profile <- measures time of each stage (total and per fund), bytes downloaded, rows parsed and kept,
+                     and saves report to provided JSON file in Chrome trace format (flame graph in chrome://tracing)
 
 .OUTPUTS
     None
@@ -44,12 +104,13 @@
 
 """
 import argparse
+from dataclasses import fields
 from Dependencies.Class_Analyzer import Analyzer
 from Dependencies.Function_config import getConfiguration, setCorrectPath
 
 programSynopsis = """
 Program to analyze investment funds defined in config file.
-For each fund int selected timeframe following parameters will be calculated: Refund ; Rise ratio ; Avg Increase ; Avg Decrease.
+For each fund int selected timeframe following parameters will be calculated: Refund ; Rise ratio ; Avg Increase ; Avg Decrease ; Volatility ; Max Drawdown ; Sharpe ; Sortino.
 Each described param will be calculated for current period and same time last year.
 """
 
@@ -59,7 +120,8 @@ parser.add_argument(
     "--Time_Period_In_Months",
     action="store",
     type=int,
-    help="Replaces TimePeriodInMonths to the number passed to script",
+    nargs="+",
+    help="Replaces TimePeriodInMonths to the number (or numbers) passed to script",
 )
 parser.add_argument(
     "-c",
@@ -67,15 +129,188 @@ parser.add_argument(
     action="store",
     help="Config file name, which must be located in the same dir as executed file",
 )
+parser.add_argument(
+    "--no-cache",
+    dest="No_Cache",
+    action="store_true",
+    help="Downloads quotations without using local cache",
+)
+parser.add_argument(
+    "--refresh",
+    dest="Refresh",
+    action="store_true",
+    help="Downloads quotations regardless of cache TTL and merges them into cache",
+)
+parser.add_argument(
+    "--no-plot",
+    dest="No_Plot",
+    action="store_true",
+    help="Skips plot, only summary is printed to console",
+)
+parser.add_argument(
+    "--output",
+    dest="Output",
+    choices=["table", "json", "csv"],
+    default="table",
+    help="Format of summary printed to console",
+)
+parser.add_argument(
+    "--plot-file",
+    dest="Plot_File",
+    action="store",
+    help="Saves plot to file (png, svg or pdf) instead of displaying it",
+)
+parser.add_argument(
+    "--correlation",
+    dest="Correlation",
+    action="store_true",
+    help="Prints correlation and covariance matrix of daily changes of funds",
+)
+parser.add_argument(
+    "--correlation-file",
+    dest="Correlation_File",
+    action="store",
+    help="Saves correlation matrix heatmap to file (png, svg or pdf)",
+)
+parser.add_argument(
+    "--seasonal-years",
+    dest="Seasonal_Years",
+    action="store",
+    type=int,
+    help="Compares the same period in provided number of previous years",
+)
+parser.add_argument(
+    "--seasonal-file",
+    dest="Seasonal_File",
+    action="store",
+    help="Saves refund rate in the same period of previous years to file (png, svg or pdf)",
+)
+parser.add_argument(
+    "--lags",
+    dest="Lags",
+    action="store",
+    type=int,
+    nargs="+",
+    help="Calculates change of quotation over each provided number of days",
+)
+parser.add_argument(
+    "--serve",
+    dest="Serve",
+    action="store_true",
+    help="Runs as local HTTP service with funds kept in memory",
+)
+parser.add_argument(
+    "--port",
+    dest="Port",
+    action="store",
+    type=int,
+    help="Replaces port of HTTP service defined in config file",
+)
+parser.add_argument(
+    "--watch",
+    dest="Watch",
+    action="store",
+    type=float,
+    metavar="INTERVAL",
+    help="Checks funds every INTERVAL minutes and displays summary of funds with changed quotation",
+)
+parser.add_argument(
+    "--workers",
+    dest="Workers",
+    action="store",
+    type=int,
+    help="Replaces number of processes summary is calculated in",
+)
+parser.add_argument(
+    "--universe",
+    dest="Universe",
+    action="store",
+    help="Loads funds from file saved with --save-universe instead of downloading them",
+)
+parser.add_argument(
+    "--save-universe",
+    dest="Save_Universe",
+    action="store",
+    help="Saves quotations of all analyzed funds to one memory-mapped file",
+)
+parser.add_argument(
+    "--profile",
+    dest="Profile",
+    action="store",
+    help="Saves time of each stage and counters to provided JSON file",
+)
 
 def main(options):
     setCorrectPath()
 
+    if options.Profile != None:
+        # Stage timers and counters are collected only after profiling is enabled
+        from Dependencies.Class_Profiler import enableProfiling
+        profiler = enableProfiling()
+
     config = getConfiguration(options)
+    # Server settings are used only by --serve
+    serverConfig = config.pop("Server", {})
+
+    if options.Serve:
+        # Imported here, so one-off analysis does not load HTTP server
+        from Dependencies.Class_AnalyzerService import AnalyzerService
+
+        if options.Port != None:
+            serverConfig["Port"] = options.Port
+        # settings of one-off analysis only (e.g. Workers, StreamQuotation) are not used by service
+        serviceSettings = {field.name for field in fields(AnalyzerService) if field.init}
+        try:
+            AnalyzerService(
+                **{key: value for key, value in config.items() if key in serviceSettings},
+                **serverConfig
+            ).serve()
+        except KeyboardInterrupt:
+            # service is stopped with Ctrl+C
+            pass
+        finally:
+            if options.Profile != None:
+                profiler.saveReport(options.Profile)
+        exit(0)
+
+    if options.Watch != None:
+        # Imported here, so one-off analysis does not load watch mode
+        from Dependencies.Class_AnalyzerWatcher import AnalyzerWatcher
+
+        watcherSettings = {field.name for field in fields(AnalyzerWatcher) if field.init}
+        try:
+            AnalyzerWatcher(
+                **{key: value for key, value in config.items() if key in watcherSettings},
+                IntervalInMinutes=options.Watch,
+                OutputFormat=options.Output
+            ).watch()
+        finally:
+            if options.Profile != None:
+                profiler.saveReport(options.Profile)
+        exit(0)
     
     funds = Analyzer(**config)
 
-    funds.showAnalysisPyPlot()
+    funds.exportSummary(options.Output)
+
+    if options.Save_Universe != None:
+        funds.saveUniverse(options.Save_Universe)
+
+    if options.Correlation:
+        funds.exportCorrelation(options.Output)
+    if options.Correlation_File != None:
+        funds.saveCorrelationPlot(options.Correlation_File)
+
+    if options.Seasonal_File != None:
+        funds.saveSeasonalityPlot(options.Seasonal_File)
+
+    if options.Plot_File != None:
+        funds.savePlot(options.Plot_File)
+    elif not options.No_Plot:
+        funds.showPyPlot()
+
+    if options.Profile != None:
+        profiler.saveReport(options.Profile)
 
     exit(0)
 
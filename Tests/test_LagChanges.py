@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+
+from Dependencies.Class_Analyzer import Analyzer
+from Dependencies.Function_DownloadFundQuotation import decodeFundSeries, filterFundSeries
+from Benchmarks.Function_StubServer import generateFundURLs, generateQuotationPayload
+
+
+def createAnalyzer(lags: list[int], TimePeriodInMonths: int = 3) -> Analyzer:
+    URLs = generateFundURLs(2)
+    return Analyzer(
+        URLs=URLs,
+        TimePeriodInMonths=TimePeriodInMonths,
+        Lags=lags,
+        DownloadedQuotations={
+            url: filterFundSeries(
+                decodeFundSeries(json.dumps(generateQuotationPayload(url.split("/")[4], 1500)).encode()),
+                TimePeriodInMonths
+            )
+            for url in URLs
+        },
+    )
+
+
+def test_lag_longer_than_window_is_plotted():
+    analyzer = createAnalyzer([1, 30, 90, 365])
+
+    for data in analyzer.getDataToPlots():
+        for column in ("Change 90 days", "Change 365 days"):
+            for series in data[column].values():
+                assert np.count_nonzero(series.Value) > 0
+
+
+def test_last_plotted_lag_change_matches_summary():
+    analyzer = createAnalyzer([1, 30, 90, 365])
+
+    for column in analyzer.getLagColumns():
+        for fund, series in analyzer.getDataToPlots()[0][column].items():
+            # plotted change is rounded to 3 digits, summary one to 2 digits
+            assert abs(series.Value[-1] - analyzer.Summary[fund][column]) <= 0.0051
+
+
+def test_single_lag():
+    analyzer = createAnalyzer([1])
+
+    for fund in analyzer.FundsList:
+        assert analyzer.getDataToPlots()[0]["Change 1 days"][fund].Value.ndim == 1
+        assert analyzer.FundsList[fund].calculateValueChange(1, analyzer.FundsList[fund].Series).ndim == 1